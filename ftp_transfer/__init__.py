@@ -3,9 +3,15 @@ FTP Transfer Tool
 一个用于在FTP服务器之间传输文件并提供通知功能的工具包
 """
 
-__version__ = "0.0.8"
-__author__ = "Emrys.Liu"
-__email__ = "emrys.liu@foxmail.com"
+from ._version import __version__, __author__, __email__
 
-from .core import FTPTransfer
-from .config import load_config
+# 延迟导入重量级子模块（core会连带导入loguru、yaml、paramiko），
+# 使得只读取版本信息的场景（如--version、setup.py）不必支付完整导入开销
+def __getattr__(name):
+    if name == 'FTPTransfer':
+        from .core import FTPTransfer
+        return FTPTransfer
+    if name == 'load_config':
+        from .config import load_config
+        return load_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,8 @@
+"""包版本信息
+
+独立成模块，避免读取版本号时触发ftp_transfer包的完整导入（loguru、yaml、paramiko等）。
+"""
+
+__version__ = "0.0.8"
+__author__ = "Emrys.Liu"
+__email__ = "emrys.liu@foxmail.com"
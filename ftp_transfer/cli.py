@@ -1,19 +1,53 @@
 import argparse
 import os
+import re
 import sys
 import json
 from typing import Dict, Any
 import logging
-from ftp_transfer import __version__, __author__, __email__
-from ftp_transfer.config import update_config, interactive_update_config, create_config
+from ftp_transfer._version import __version__, __author__, __email__
 from ftp_transfer.config_utils import DEFAULT_CONFIG_PATH
-from ftp_transfer.core import FTPTransfer
-from ftp_transfer.logger import setup_logger
-from ftp_transfer.utils import find_from_examples, find_from_package
+
+# 注意: FTPTransfer、config操作函数等重量级模块（连带loguru、yaml、paramiko）
+# 在各handle_*函数内部按需导入，避免--version等轻量命令支付完整导入开销
 
 # 设置日志
 logger = logging.getLogger(__name__)
 
+# 常见字面量的快速映射，避免为每个参数值启动完整JSON解析器
+_LITERAL_VALUES = {'true': True, 'false': False, 'null': None, 'none': None}
+
+# 与JSON数字文法一致的形状检查：只有这种形状才做数字转换，
+# 保证'0123'、'1_0'、'nan'等在json.loads下保持字符串的值不变
+_JSON_NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+
+
+def _coerce_value(value: str) -> Any:
+    """将命令行中的配置值字符串转换为合适的Python类型
+
+    仅对形如JSON容器（[...]、{...}）的值调用json.loads；
+    布尔/空值通过查表转换，数字按JSON数字文法识别后直接转换，
+    并保留字符串原始大小写
+
+    :param value: 命令行传入的值字符串
+    :return: 转换后的值
+    """
+    lowered = value.lower()
+    if lowered in _LITERAL_VALUES:
+        return _LITERAL_VALUES[lowered]
+    if _JSON_NUMBER_RE.fullmatch(value):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    if (value.startswith('[') and value.endswith(']')) or \
+            (value.startswith('{') and value.endswith('}')):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
 
 def parse_args() -> argparse.Namespace:
     """解析命令行参数"""
@@ -60,15 +94,21 @@ def parse_args() -> argparse.Namespace:
 
 
 def _flatten_dict(d: Dict, parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
-    """将嵌套字典展平，使用点表示法连接键"""
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(_flatten_dict(v, new_key, sep=sep).items())
-        else:
-            items.append((new_key, v))
-    return dict(items)
+    """将嵌套字典展平，使用点表示法连接键
+
+    使用显式栈迭代遍历，避免递归调用及每层重建中间字典的开销
+    """
+    result = {}
+    stack = [(parent_key, d)]
+    while stack:
+        prefix, current = stack.pop()
+        for k, v in current.items():
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, v))
+            else:
+                result[new_key] = v
+    return result
 
 
 def handle_version() -> None:
@@ -85,6 +125,7 @@ def handle_version_command() -> None:
     print(f"作者: {__author__}")
     print(f"邮箱: {__email__}")
     print("\n版本更新内容:")
+    from ftp_transfer.utils import find_from_package
     with open(find_from_package('changelog.md'), 'r', encoding='utf-8') as f:
         for line in f:
             print(line, end='')
@@ -95,6 +136,8 @@ def handle_version_command() -> None:
 def handle_update_config(args: argparse.Namespace) -> None:
     """处理更新配置命令"""
     try:
+        from ftp_transfer.config import update_config
+
         # 创建要更新的配置字典
         updates = {}
         
@@ -114,14 +157,7 @@ def handle_update_config(args: argparse.Namespace) -> None:
                 current = current[k]
             
             # 尝试解析值的类型
-            try:
-                # 尝试解析为JSON
-                parsed_value = json.loads(value.lower())
-            except json.JSONDecodeError:
-                # 如果不是有效的JSON，保持为字符串
-                parsed_value = value
-            
-            current[keys[-1]] = parsed_value
+            current[keys[-1]] = _coerce_value(value)
         
         if not updates:
             print("错误: 未指定要更新的配置项")
@@ -144,6 +180,7 @@ def handle_update_config(args: argparse.Namespace) -> None:
 def handle_interactive_update_config(args: argparse.Namespace) -> None:
     """处理交互式更新配置命令"""
     try:
+        from ftp_transfer.config import interactive_update_config
         interactive_update_config(args.config_path)
     except Exception as e:
         logger.error(f"交互式更新配置失败: {str(e)}")
@@ -154,6 +191,7 @@ def handle_interactive_update_config(args: argparse.Namespace) -> None:
 def handle_create_config(args: argparse.Namespace) -> None:
     """处理创建配置命令"""
     try:
+        from ftp_transfer.config import create_config
         create_config(args.config_path)
         print(f"配置文件已成功创建: {args.config_path}")
     except Exception as e:
@@ -165,6 +203,8 @@ def handle_create_config(args: argparse.Namespace) -> None:
 def handle_transfer(args: argparse.Namespace) -> None:
     """处理文件传输命令"""
     try:
+        from ftp_transfer.core import FTPTransfer
+
         # 如果命令是transfer，使用args.config，否则使用args.config_path
         config_path = args.config if hasattr(args, 'config') and args.config else DEFAULT_CONFIG_PATH
         ftp_transfer = FTPTransfer(config_path)
@@ -196,6 +236,7 @@ def handle_config_example():
     
     try:
         # 尝试读取示例文件
+        from ftp_transfer.utils import read_example_file
         example_content = read_example_file('ftp_config.yaml.example')
         print(example_content)
         print("=" * 60)
@@ -208,6 +249,23 @@ def handle_config_example():
 
 def main() -> None:
     """主函数入口"""
+    # 热路径快速分发：默认的transfer命令和--version占绝大多数调用，
+    # 无需构建完整的argparse子解析器（构建开销在短命CLI中占比可观）。
+    # 其余子命令回退到parse_args()，--help等仍由argparse处理
+    argv = sys.argv[1:]
+    if argv == ['--version'] or argv == ['-v']:
+        handle_version()
+    if not argv or (len(argv) == 2 and argv[0] in ('-c', '--config')):
+        args = argparse.Namespace(
+            command=None,
+            version=False,
+            config=argv[1] if argv else DEFAULT_CONFIG_PATH,
+        )
+        from ftp_transfer.logger import setup_logger
+        setup_logger()
+        handle_transfer(args)
+        return
+
     args = parse_args()
     
     # 处理版本参数和命令
@@ -217,6 +275,7 @@ def main() -> None:
     if args.command == 'version':
         handle_version_command()
     
+    from ftp_transfer.logger import setup_logger
     setup_logger()
     # 处理不同的命令
     if args.command == 'update-config':
@@ -1,33 +1,172 @@
+import copy
+import functools
+import io
 import yaml
-import getpass
-import traceback
+import pickle
+import struct
 import os
-from loguru import logger
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_logger = None
+
+def _log():
+    """延迟获取loguru的logger实例
+
+    loguru导入开销较大（涉及sink初始化等），延迟到第一次真正记录日志时再导入，
+    使update-config等不产生日志的快速路径不必支付这部分启动成本
+    """
+    global _logger
+    if _logger is None:
+        from loguru import logger
+        _logger = logger
+    return _logger
+
+# 优先使用libyaml的C实现，解析/输出速度远高于纯Python实现
+# 如果PyYAML没有编译libyaml扩展，则回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# 预先固化dump选项，调用点无需每次传递/解析关键字参数；
+# sort_keys=False同时省去每次dump对键的O(N log N)排序，保留插入顺序
+_yaml_dump = functools.partial(
+    yaml.dump,
+    Dumper=_YamlDumper,
+    allow_unicode=True,
+    default_flow_style=False,
+    sort_keys=False,
+)
+
+# 进程内配置缓存: {绝对路径: (mtime_ns, 文件大小, 配置字典)}
+# 同一进程内重复调用load_config时直接命中内存，无需任何文件解析
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+def _config_cache_path(config_path: str) -> str:
+    """获取配置文件对应的解析缓存文件路径"""
+    return config_path + '.cache'
+
+def _read_config_cache(config_path: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    读取配置解析缓存
+
+    缓存文件格式为：前8字节为配置文件的mtime_ns，其后为pickle序列化的配置字典。
+    缓存过期（mtime不匹配）或损坏时返回None，由调用方回退到YAML解析。
+
+    :param config_path: 配置文件路径
+    :param mtime_ns: 配置文件当前的修改时间（纳秒）
+    :return: 缓存的配置字典，缓存无效时返回None
+    """
+    try:
+        with open(_config_cache_path(config_path), 'rb') as f:
+            data = f.read()
+        if len(data) <= 8:
+            return None
+        cached_mtime_ns, = struct.unpack('<q', data[:8])
+        if cached_mtime_ns != mtime_ns:
+            return None
+        return pickle.loads(data[8:])
+    except (OSError, pickle.PickleError, struct.error):
+        return None
+
+def _write_config_cache(config_path: str, mtime_ns: int, config: Dict[str, Any]) -> None:
+    """
+    写入配置解析缓存（原子写入，避免产生损坏的缓存文件）
+
+    缓存写入失败不影响主流程，仅记录调试日志。
+
+    :param config_path: 配置文件路径
+    :param mtime_ns: 配置文件当前的修改时间（纳秒）
+    :param config: 解析后的配置字典
+    """
+    cache_path = _config_cache_path(config_path)
+    tmp_path = f"{cache_path}.tmp.{os.getpid()}"
+    try:
+        # 缓存包含完整配置（含服务器密码），权限与_atomic_write_yaml
+        # 一致设为0o600，避免旁路泄露YAML里受保护的内容
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(struct.pack('<q', mtime_ns))
+            f.write(pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PickleError) as e:
+        _log().debug(f"写入配置缓存失败: {str(e)}")
+
+def _atomic_write_yaml(config_path: str, config: Dict[str, Any]) -> None:
+    """
+    原子写入YAML配置文件
+
+    先在内存中完成YAML序列化，再以单次写入+os.replace落盘：
+    既把PyYAML逐token的小块write合并为一次系统调用，
+    又保证进程中途退出时不会留下截断的配置文件。
+    文件权限设为0o600，保护配置中的服务器密码。
+
+    :param config_path: 配置文件路径
+    :param config: 要写入的配置字典
+    """
+    # 直接dump为UTF-8字节流，省去先生成str再整体encode的一次拷贝
+    buf = io.BytesIO()
+    _yaml_dump(config, buf, encoding='utf-8')
+    data = buf.getvalue()
+
+    tmp_path = f"{config_path}.tmp.{os.getpid()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, config_path)
+
+def _invalidate_config_cache(config_path: str) -> None:
+    """删除配置解析缓存（进程内与磁盘），在配置文件被修改后调用"""
+    _CONFIG_CACHE.pop(os.path.abspath(config_path), None)
+    try:
+        os.remove(_config_cache_path(config_path))
+    except OSError:
+        pass
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """
     加载YAML配置文件
-    
+
+    配置文件未变化时优先读取二进制解析缓存，避免每次运行都重新解析YAML。
+
     :param config_path: 配置文件路径
     :return: 配置字典
     """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            logger.info(f"成功加载配置文件: {config_path}")
-            return config
+        abs_path = os.path.abspath(config_path)
+        st = os.stat(config_path)
+        mtime_ns = st.st_mtime_ns
+
+        # 优先命中进程内缓存（返回深拷贝，避免调用方修改影响缓存）
+        cached_entry = _CONFIG_CACHE.get(abs_path)
+        if cached_entry is not None and cached_entry[0] == mtime_ns and cached_entry[1] == st.st_size:
+            return copy.deepcopy(cached_entry[2])
+
+        # 其次读取磁盘上的解析缓存
+        config = _read_config_cache(config_path, mtime_ns)
+        if config is not None:
+            _log().info(f"成功加载配置文件（缓存）: {config_path}")
+        else:
+            # 一次性读入整个文件再解析，避免解析器经由文件对象做多次小块read
+            with open(config_path, 'rb') as f:
+                config = yaml.load(f.read(), Loader=_YamlLoader)
+            _log().info(f"成功加载配置文件: {config_path}")
+            _write_config_cache(config_path, mtime_ns, config)
+
+        _CONFIG_CACHE[abs_path] = (mtime_ns, st.st_size, copy.deepcopy(config))
+        return config
     except FileNotFoundError:
-        logger.error(f"配置文件不存在: {config_path}")
-        logger.debug(traceback.format_exc())
+        _log().exception(f"配置文件不存在: {config_path}")
         raise
     except yaml.YAMLError as e:
-        logger.error(f"配置文件格式错误: {str(e)}")
-        logger.debug(traceback.format_exc())
+        _log().exception(f"配置文件格式错误: {str(e)}")
         raise
     except Exception as e:
-        logger.error(f"加载配置文件失败: {str(e)}")
-        logger.debug(traceback.format_exc())
+        _log().exception(f"加载配置文件失败: {str(e)}")
         raise
 
 def update_config(config_path: str, updates: Dict[str, Any]) -> None:
@@ -40,39 +179,106 @@ def update_config(config_path: str, updates: Dict[str, Any]) -> None:
     try:
         # 检查配置文件是否存在
         if not os.path.exists(config_path):
-            logger.error(f"配置文件不存在: {config_path}")
+            _log().error(f"配置文件不存在: {config_path}")
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
         
-        # 加载现有配置
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
+        # 加载现有配置（一次性读入整个文件再解析）
+        with open(config_path, 'rb') as f:
+            config = yaml.load(f.read(), Loader=_YamlLoader) or {}
         
-        # 递归更新配置
-        def recursive_update(current: Dict[str, Any], update_values: Dict[str, Any]) -> Dict[str, Any]:
+        # 迭代更新配置：用显式栈深入嵌套字典，两边都是字典则继续深入，否则直接替换
+        # 避免递归版本每层创建调用帧的开销
+        stack = [(config, updates)]
+        while stack:
+            current, update_values = stack.pop()
             for key, value in update_values.items():
-                if key in current and isinstance(current[key], dict) and isinstance(value, dict):
-                    # 如果当前值和新值都是字典，递归更新
-                    current[key] = recursive_update(current[key], value)
+                current_value = current.get(key)
+                if type(current_value) is dict and type(value) is dict:
+                    stack.append((current_value, value))
                 else:
-                    # 否则直接替换
                     current[key] = value
-            return current
+        updated_config = config
         
-        # 应用更新
-        updated_config = recursive_update(config, updates)
-        
-        # 保存更新后的配置
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(updated_config, f, default_flow_style=False, allow_unicode=True)
-        
-        logger.info(f"配置文件已成功更新: {config_path}")
+        # 保存更新后的配置（原子写入）
+        _atomic_write_yaml(config_path, updated_config)
+
+        # 配置已变化，删除解析缓存
+        _invalidate_config_cache(config_path)
+
+        _log().info(f"配置文件已成功更新: {config_path}")
         
     except Exception as e:
-        logger.error(f"更新配置文件失败: {str(e)}")
-        logger.debug(traceback.format_exc())
+        _log().exception(f"更新配置文件失败: {str(e)}")
         raise
 
-def server_config(_config: dict|None = None, backup: bool = True) -> dict: 
+# 视为"是"的回答集合，单次集合成员测试替代散落各处的字符串比较
+_YES = frozenset({'y', 'yes', '1', 'true'})
+
+def _ask_bool(prompt: str, default: bool) -> bool:
+    """
+    询问一个y/n问题，直接回车保持默认值
+
+    单次提问即可完成"是否修改+新值"两步操作，减少交互轮次
+
+    :param prompt: 提示语
+    :param default: 默认值（回车时返回）
+    :return: 用户选择的布尔值
+    """
+    answer = input(f"{prompt} (y/n, 当前: {'y' if default else 'n'}): ").strip().lower()
+    if answer == '':
+        return default
+    return answer in _YES
+
+def _ask_str(prompt: str, default) -> str:
+    """
+    询问一个字符串值，提示语中直接展示当前值，回车保持当前值
+
+    把"打印当前值+询问新值"两次终端往返合并为一次
+
+    :param prompt: 提示语
+    :param default: 当前值（回车时返回）
+    :return: 用户输入的新值或当前值
+    """
+    return input(f"{prompt} (当前: {default if default not in (None, '') else '未设置'}, 按Enter保持当前): ") or default
+
+def _ask_int(prompt: str, default: int) -> int:
+    """
+    询问一个整数值，提示语中直接展示当前值，回车保持当前值
+
+    :param prompt: 提示语
+    :param default: 当前值（回车时返回）
+    :return: 用户输入的新值或当前值
+    """
+    answer = input(f"{prompt} (当前: {default}, 按Enter保持当前): ")
+    return int(answer) if answer else default
+
+@dataclass(frozen=True, slots=True)
+class _Field:
+    """交互式更新向导中一个统一流程字段的声明
+
+    :param key: 配置字典中的键名
+    :param label: 提示语
+    :param ask: 询问函数（_ask_str/_ask_int/_ask_bool之一）
+    """
+    key: str
+    label: str
+    ask: Callable[[str, Any], Any]
+
+
+def _update_fields(config: dict, fields: Tuple[_Field, ...]) -> None:
+    """按字段表就地更新配置中的统一流程字段
+
+    "展示当前值/询问新值"的样板流程由字段表驱动，
+    各update_*向导只保留真正有条件分支的字段逻辑
+
+    :param config: 待更新的配置字典（就地修改）
+    :param fields: 字段声明表
+    """
+    for field in fields:
+        config[field.key] = field.ask(field.label, config.get(field.key))
+
+
+def server_config(_config: dict|None = None, backup: bool = True) -> dict:
     """
     配置服务器信息
     
@@ -80,7 +286,7 @@ def server_config(_config: dict|None = None, backup: bool = True) -> dict:
     """
 
     default_config = {
-        'use_sftp': input("是否使用SFTP? (y/n, 默认n): ").lower() == 'y', 
+        'use_sftp': _ask_bool("是否使用SFTP?", False),
         'host': input("服务器地址: "),
         'port': None,
         'user': input("用户名: "),
@@ -97,7 +303,7 @@ def server_config(_config: dict|None = None, backup: bool = True) -> dict:
     }
 
     if backup:
-        default_config['enable_backup'] = input("是否启用备份功能? (y/n, 默认y): ").lower() != 'n'
+        default_config['enable_backup'] = _ask_bool("是否启用备份功能?", True)
         if default_config['enable_backup']:
                 default_config['backup_directory'] = input("备份目录路径 (可选，按Enter跳过): ") or None
     else:
@@ -113,13 +319,84 @@ def server_config(_config: dict|None = None, backup: bool = True) -> dict:
                 default_config['passphrase'] = input("私钥密码 (可选，按Enter跳过): ") or None
     else:
         default_config['password'] = input("密码: ") or None
-        default_config['use_ftps'] = input("是否使用FTPS? (y/n, 默认n): ").lower() == 'y'
+        default_config['use_ftps'] = _ask_bool("是否使用FTPS?", False)
         default_config['port'] = int(input("端口 (默认: FTP=21, FTPS=990)") or (990 if default_config['use_ftps'] else 21))
-        default_config['tls_implicit'] = input("是否使用隐式TLS? (y/n, 默认n): ").lower() == 'y'
-        default_config['use_passive'] = input("是否使用被动模式? (y/n, 默认y): ").lower() != 'n'
+        default_config['tls_implicit'] = _ask_bool("是否使用隐式TLS?", False)
+        default_config['use_passive'] = _ask_bool("是否使用被动模式?", True)
         
     return default_config
 
+# 交互式更新向导使用的各节默认配置。
+# 提升到模块级常量，避免每次进入向导都重建字面量字典；
+# 使用处仅做一次{**defaults, **user}合并，不会修改这些常量本身
+_DEFAULT_SERVER_CONFIG = {
+    'host': '',
+    'port': 21,
+    'user': '',
+    'password': None,
+    'directory': '',
+    'encoding': 'utf-8',
+    'use_ftps': False,
+    'tls_implicit': False,
+    'use_passive': True,
+    'use_sftp': False,
+    'key_file': None,
+    'passphrase': None
+}
+
+_DEFAULT_BACKUP_FIELDS = {
+    'enable_backup': False,
+    'backup_directory': None
+}
+
+_DEFAULT_FILE_FILTER_CONFIG = {
+    'type': 'all'
+}
+
+_DEFAULT_LOG_CONFIG = {
+    'enabled': True,
+    'level': 'INFO',
+    'file': 'ftp_transfer.log'
+}
+
+_DEFAULT_EMAIL_CONFIG = {
+    'enabled': False,
+    'smtp_server': '',
+    'smtp_port': 587,
+    'use_tls': True,
+    'username': '',
+    'password': '',
+    'from_address': '',
+    'to_address': '',
+    'subject': 'FTP/SFTP传输任务完成通知'
+}
+
+# 各节统一流程字段的声明表，与_update_fields配合使用
+_SERVER_FIELDS = (
+    _Field('host', "服务器地址", _ask_str),
+    _Field('port', "端口", _ask_int),
+    _Field('user', "用户名", _ask_str),
+)
+
+_LOG_FIELDS = (
+    _Field('enabled', "是否启用日志?", _ask_bool),
+    _Field('level', "日志级别 (DEBUG, INFO, WARNING, ERROR)", _ask_str),
+    _Field('file', "日志文件路径", _ask_str),
+)
+
+_EMAIL_FIELDS = (
+    _Field('smtp_server', "SMTP服务器地址", _ask_str),
+    _Field('smtp_port', "SMTP端口", _ask_int),
+    _Field('use_tls', "是否使用TLS?", _ask_bool),
+    _Field('username', "用户名", _ask_str),
+)
+
+_EMAIL_ADDRESS_FIELDS = (
+    _Field('from_address', "发件人地址", _ask_str),
+    _Field('to_address', "收件人地址", _ask_str),
+    _Field('subject', "邮件主题", _ask_str),
+)
+
 def update_server_config(server_config: dict, backup: bool = True) -> dict:
     """
     更新服务器配置
@@ -128,95 +405,50 @@ def update_server_config(server_config: dict, backup: bool = True) -> dict:
     :param backup: 是否启用备份配置
     :return: 更新后的服务器配置
     """
-    # 复制配置，避免直接修改传入的字典
-    updated_config = server_config.copy()
-    
-    # 确保所有必要的配置项存在
-    default_server_config = {
-        'host': '',
-        'port': 21,
-        'user': '',
-        'password': None,
-        'directory': '',
-        'encoding': 'utf-8',
-        'use_ftps': False,
-        'tls_implicit': False,
-        'use_passive': True,
-        'use_sftp': False,
-        'key_file': None,
-        'passphrase': None
-    }
-    
+    # 合并默认配置（C层字典合并，同时产生新字典避免修改传入配置）
     if backup:
-        default_server_config['enable_backup'] = False
-        default_server_config['backup_directory'] = None
-    
-    # 合并默认配置
-    for key, default_value in default_server_config.items():
-        if key not in updated_config:
-            updated_config[key] = default_value
-    
-    print(f"当前地址: {updated_config['host']}")
-    updated_config['host'] = input("新地址 (按Enter保持当前): ") or updated_config['host']
-    
-    print(f"当前端口: {updated_config['port']}")
-    new_port = input("新端口 (按Enter保持当前): ")
-    if new_port:
-        updated_config['port'] = int(new_port)
-    
-    print(f"当前用户名: {updated_config['user']}")
-    updated_config['user'] = input("新用户名 (按Enter保持当前): ") or updated_config['user']
+        updated_config = {**_DEFAULT_SERVER_CONFIG, **_DEFAULT_BACKUP_FIELDS, **server_config}
+    else:
+        updated_config = {**_DEFAULT_SERVER_CONFIG, **server_config}
     
+    _update_fields(updated_config, _SERVER_FIELDS)
+
     # 询问是否修改密码
-    if input("是否修改密码? (y/n, 默认n): ").lower() == 'y':
+    if _ask_bool("是否修改密码?", False):
         updated_config['password'] = input("新密码 (按Enter键如果不设置密码，使用密钥认证): ")
     
-    print(f"当前目录: {updated_config['directory']}")
-    updated_config['directory'] = input("新目录 (按Enter保持当前): ") or updated_config['directory']
-    
-    print(f"当前文件编码: {updated_config['encoding']}")
-    updated_config['encoding'] = input("新编码 (按Enter保持当前): ") or updated_config['encoding']
-    
-    print(f"当前使用FTPS: {'是' if updated_config['use_ftps'] else '否'}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['use_ftps'] = input("是否使用FTPS? (y/n): ").lower() == 'y'
-        if updated_config['use_ftps']:
-            print(f"当前使用隐式TLS: {'是' if updated_config['tls_implicit'] else '否'}")
-            if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-                updated_config['tls_implicit'] = input("是否使用隐式TLS? (y/n): ").lower() == 'y'
-                # 如果使用隐式TLS且端口为21，自动调整为990
-                if updated_config['tls_implicit'] and updated_config['port'] == 21:
-                    print("检测到使用隐式TLS，自动将端口设置为990")
-                    updated_config['port'] = 990
-    
-    print(f"当前使用被动模式: {'是' if updated_config['use_passive'] else '否'}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['use_passive'] = input("是否使用被动模式? (y/n): ").lower() != 'n'
+    updated_config['directory'] = _ask_str("目录路径", updated_config['directory'])
+    updated_config['encoding'] = _ask_str("文件编码", updated_config['encoding'])
     
+    updated_config['use_ftps'] = _ask_bool("是否使用FTPS?", updated_config['use_ftps'])
+    if updated_config['use_ftps']:
+        updated_config['tls_implicit'] = _ask_bool("是否使用隐式TLS?", updated_config['tls_implicit'])
+        # 如果使用隐式TLS且端口为21，自动调整为990
+        if updated_config['tls_implicit'] and updated_config['port'] == 21:
+            print("检测到使用隐式TLS，自动将端口设置为990")
+            updated_config['port'] = 990
+
+    updated_config['use_passive'] = _ask_bool("是否使用被动模式?", updated_config['use_passive'])
+
     if backup:
-        print(f"当前启用备份: {'是' if updated_config['enable_backup'] else '否'}")
-        if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-            updated_config['enable_backup'] = input("是否启用备份功能? (y/n): ").lower() != 'n'
-            if updated_config['enable_backup']:
-                print(f"当前备份目录: {updated_config['backup_directory'] or '未设置'}")
-                updated_config['backup_directory'] = input("新备份目录 (按Enter保持当前): ") or updated_config['backup_directory']
-    
+        updated_config['enable_backup'] = _ask_bool("是否启用备份功能?", updated_config['enable_backup'])
+        if updated_config['enable_backup']:
+            updated_config['backup_directory'] = _ask_str("备份目录路径", updated_config['backup_directory'])
+
     # SFTP相关配置
-    print(f"当前使用SFTP: {'是' if updated_config.get('use_sftp', False) else '否'}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['use_sftp'] = input("是否使用SFTP? (y/n): ").lower() == 'y'
+    updated_config['use_sftp'] = _ask_bool("是否使用SFTP?", updated_config.get('use_sftp', False))
+    if updated_config['use_sftp']:
         # 如果切换到SFTP且端口为21，自动调整为22
-        if updated_config['use_sftp'] and updated_config['port'] == 21:
+        if updated_config['port'] == 21:
             print("检测到使用SFTP，自动将端口设置为22")
             updated_config['port'] = 22
     
     # 如果使用SFTP，询问密钥文件和密码
     if updated_config.get('use_sftp', False):
-        print(f"当前私钥文件: {updated_config.get('key_file', None) or '未设置'}")
-        updated_config['key_file'] = input("新私钥文件路径 (按Enter保持当前): ") or updated_config.get('key_file', None)
+        updated_config['key_file'] = _ask_str("私钥文件路径", updated_config.get('key_file', None))
         
         # 询问是否修改私钥密码
-        if input("是否修改私钥密码? (y/n, 默认n): ").lower() == 'y':
+        if _ask_bool("是否修改私钥密码?", False):
             updated_config['passphrase'] = input("新私钥密码 (按Enter键如果不设置): ") or None
     
     return updated_config
@@ -228,17 +460,8 @@ def update_file_filter_config(file_filter_config: dict) -> dict:
     :param file_filter_config: 现有文件过滤配置
     :return: 更新后的文件过滤配置
     """
-    updated_config = file_filter_config.copy()
-    
-    # 确保所有必要的配置项存在
-    default_file_filter_config = {
-        'type': 'all'
-    }
-    
-    # 合并默认配置
-    for key, default_value in default_file_filter_config.items():
-        if key not in updated_config:
-            updated_config[key] = default_value
+    # 确保所有必要的配置项存在，合并默认配置
+    updated_config = {**_DEFAULT_FILE_FILTER_CONFIG, **file_filter_config}
     
     print(f"当前过滤类型: {updated_config.get('type', 'all')}")
     if input("是否修改? (y/n, 默认n): ").lower() == 'y':
@@ -296,32 +519,11 @@ def update_log_config(log_config: dict) -> dict:
     :param log_config: 现有日志配置
     :return: 更新后的日志配置
     """
-    updated_config = log_config.copy()
-    
-    # 确保所有必要的配置项存在
-    default_log_config = {
-        'enabled': True,
-        'level': 'INFO',
-        'file': 'ftp_transfer.log'
-    }
-    
-    # 合并默认配置
-    for key, default_value in default_log_config.items():
-        if key not in updated_config:
-            updated_config[key] = default_value
-    
-    print(f"当前启用日志: {'是' if updated_config.get('enabled', True) else '否'}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['enabled'] = input("是否启用日志? (y/n): ").lower() != 'n'
-    
-    print(f"当前日志级别: {updated_config.get('level', 'INFO')}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['level'] = input("新日志级别 (DEBUG, INFO, WARNING, ERROR): ") or updated_config.get('level', 'INFO')
-    
-    print(f"当前日志文件: {updated_config.get('file', 'ftp_transfer.log')}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['file'] = input("新日志文件路径: ") or updated_config.get('file', 'ftp_transfer.log')
-    
+    # 确保所有必要的配置项存在，合并默认配置
+    updated_config = {**_DEFAULT_LOG_CONFIG, **log_config}
+
+    _update_fields(updated_config, _LOG_FIELDS)
+
     return updated_config
 
 def update_email_config(email_config: dict) -> dict:
@@ -331,59 +533,20 @@ def update_email_config(email_config: dict) -> dict:
     :param email_config: 现有邮件配置
     :return: 更新后的邮件配置
     """
-    updated_config = email_config.copy()
-    
-    # 确保所有必要的配置项存在
-    default_email_config = {
-        'enabled': False,
-        'smtp_server': '',
-        'smtp_port': 587,
-        'use_tls': True,
-        'username': '',
-        'password': '',
-        'from_address': '',
-        'to_address': '',
-        'subject': 'FTP/SFTP传输任务完成通知'
-    }
-    
-    # 合并默认配置
-    for key, default_value in default_email_config.items():
-        if key not in updated_config:
-            updated_config[key] = default_value
-    
-    print(f"当前启用邮件通知: {'是' if updated_config.get('enabled', False) else '否'}")
-    if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-        updated_config['enabled'] = input("是否启用邮件通知? (y/n): ").lower() == 'y'
-        
-        if updated_config['enabled']:
-            print(f"当前SMTP服务器: {updated_config.get('smtp_server', '')}")
-            updated_config['smtp_server'] = input("新SMTP服务器地址: ") or updated_config.get('smtp_server', '')
-            
-            print(f"当前SMTP端口: {updated_config.get('smtp_port', 587)}")
-            new_port = input("新SMTP端口 (默认: 587): ")
-            if new_port:
-                updated_config['smtp_port'] = int(new_port)
-            
-            print(f"当前使用TLS: {'是' if updated_config.get('use_tls', True) else '否'}")
-            if input("是否修改? (y/n, 默认n): ").lower() == 'y':
-                updated_config['use_tls'] = input("是否使用TLS? (y/n): ").lower() != 'n'
-            
-            print(f"当前用户名: {updated_config.get('username', '')}")
-            updated_config['username'] = input("新用户名: ") or updated_config.get('username', '')
-            
-            # 询问是否修改密码
-            if input("是否修改密码? (y/n, 默认n): ").lower() == 'y':
-                updated_config['password'] = input("新密码或授权码: ")
-            
-            print(f"当前发件人地址: {updated_config.get('from_address', '')}")
-            updated_config['from_address'] = input("新发件人地址: ") or updated_config.get('from_address', '')
-            
-            print(f"当前收件人地址: {updated_config.get('to_address', '')}")
-            updated_config['to_address'] = input("新收件人地址: ") or updated_config.get('to_address', '')
-            
-            print(f"当前邮件主题: {updated_config.get('subject', 'FTP/SFTP传输任务完成通知')}")
-            updated_config['subject'] = input("新邮件主题: ") or updated_config.get('subject', 'FTP/SFTP传输任务完成通知')
+    # 合并默认配置（单次C层字典合并，同时产生新字典避免修改传入配置）
+    updated_config = {**_DEFAULT_EMAIL_CONFIG, **email_config}
     
+    updated_config['enabled'] = _ask_bool("是否启用邮件通知?", updated_config.get('enabled', False))
+
+    if updated_config['enabled']:
+        _update_fields(updated_config, _EMAIL_FIELDS)
+
+        # 询问是否修改密码
+        if _ask_bool("是否修改密码?", False):
+            updated_config['password'] = input("新密码或授权码: ")
+
+        _update_fields(updated_config, _EMAIL_ADDRESS_FIELDS)
+
     return updated_config
 
 def create_config(config_file_path: str) -> None:
@@ -474,13 +637,15 @@ def create_config(config_file_path: str) -> None:
         # 确保配置文件目录存在
         os.makedirs(os.path.dirname(os.path.abspath(config_file_path)), exist_ok=True)
         
-        # 写入配置文件
-        with open(config_file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+        # 写入配置文件（原子写入）
+        _atomic_write_yaml(config_file_path, config)
+
+        # 配置已变化，删除解析缓存
+        _invalidate_config_cache(config_file_path)
         
     except Exception as e:
         print(f"创建配置文件失败: {str(e)}")
-        logger.error(f"创建配置文件失败: {str(e)}")
+        _log().error(f"创建配置文件失败: {str(e)}")
 
 
 def interactive_update_config(config_file_path: str) -> None:
@@ -552,12 +717,14 @@ def interactive_update_config(config_file_path: str) -> None:
         print("\n更新邮件通知设置:")
         config['email'] = update_email_config(config['email'])
         
-        # 写入更新后的配置文件
-        with open(config_file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+        # 写入更新后的配置文件（原子写入）
+        _atomic_write_yaml(config_file_path, config)
+
+        # 配置已变化，删除解析缓存
+        _invalidate_config_cache(config_file_path)
         
         print(f"\n配置文件已成功更新: {config_file_path}")
         
     except Exception as e:
         print(f"更新配置文件失败: {str(e)}")
-        logger.error(f"更新配置文件失败: {str(e)}")
+        _log().error(f"更新配置文件失败: {str(e)}")
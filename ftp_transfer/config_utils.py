@@ -1,36 +1,51 @@
 import os
-import traceback
-import uuid
+import secrets
 from typing import Dict, Any, Tuple, List, Optional
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.config', 'ftp_transfer', 'config.yaml')
+# 用户主目录在进程内不会变化，缓存一次避免重复调用expanduser
+_HOME = os.path.expanduser('~')
+
+DEFAULT_CONFIG_PATH = os.path.join(_HOME, '.config', 'ftp_transfer', 'config.yaml')
+
+# 跨运行持久化的远端文件时间缓存文件
+STAT_CACHE_PATH = os.path.join(_HOME, '.local', 'share', 'ftp_transfer', 'stat_cache.json')
+
+# FTP连接配置的必要字段与配置文件的必要部分
+# 预先构建为frozenset，校验时通过一次C层集合差集完成，替代逐键in检查
+_FTP_REQUIRED_KEYS = frozenset({'host', 'port', 'user', 'password', 'directory', 'encoding'})
+_REQUIRED_SECTIONS = frozenset({'source', 'destination', 'log'})
 
 
 def _ensure_directory_exists(directory_path: str) -> None:
-    """确保目录存在，如果不存在则创建"""
-    if not os.path.exists(directory_path):
-        try:
-            os.makedirs(directory_path)
-            logger.info(f"创建目录: {directory_path}")
-        except Exception as e:
-            logger.error(f"创建目录失败: {str(e)}")
-            logger.debug(traceback.format_exc())
-            raise
+    """确保目录存在，如果不存在则创建
+
+    直接调用makedirs(exist_ok=True)，省去先stat再创建的额外系统调用，
+    同时避免检查与创建之间的竞态
+    """
+    try:
+        os.makedirs(directory_path, exist_ok=True)
+    except Exception as e:
+        logger.error(f"创建目录失败: {str(e)}", exc_info=True)
+        raise
 
 
 def generate_trace_id() -> str:
-    """生成一个唯一的追踪ID"""
-    return str(uuid.uuid4())
+    """生成一个唯一的追踪ID
+
+    直接基于os.urandom生成16字节十六进制串，
+    不经过uuid模块（首次使用会经ctypes加载libuuid）
+    """
+    return secrets.token_hex(16)
 
 
 def generate_archive_dir() -> str:
     """生成临时存档目录路径"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    archive_dir = os.path.join(os.path.expanduser('~'), '.local', 'share', 'ftp_transfer', 'archives', timestamp)
+    archive_dir = os.path.join(_HOME, '.local', 'share', 'ftp_transfer', 'archives', timestamp)
     _ensure_directory_exists(archive_dir)
     return archive_dir
 
@@ -42,25 +57,25 @@ def prepare_ftp_connection(config: Dict[str, Any], ftp_type: str) -> Dict[str, A
         raise ValueError(f"配置中缺少{ftp_type}配置")
     
     ftp_config = config[ftp_type]
-    
-    # 确保必要的配置项存在
-    required_keys = ['host', 'port', 'user', 'password', 'directory', 'encoding']
-    for key in required_keys:
-        if key not in ftp_config:
-            logger.error(f"{ftp_type}配置中缺少{key}")
-            raise ValueError(f"{ftp_type}配置中缺少{key}")
-    
+
+    # 确保必要的配置项存在（单次集合差集）
+    missing_keys = _FTP_REQUIRED_KEYS - ftp_config.keys()
+    if missing_keys:
+        missing_str = '、'.join(sorted(missing_keys))
+        logger.error(f"{ftp_type}配置中缺少{missing_str}")
+        raise ValueError(f"{ftp_type}配置中缺少{missing_str}")
+
     return ftp_config
 
 
 def validate_config_structure(config: Dict[str, Any]) -> None:
     """验证配置结构的完整性"""
-    # 验证必要的配置部分
-    required_sections = ['source', 'destination', 'log']
-    for section in required_sections:
-        if section not in config:
-            logger.error(f"配置中缺少{section}部分")
-            raise ValueError(f"配置中缺少{section}部分")
+    # 验证必要的配置部分（单次集合差集）
+    missing_sections = _REQUIRED_SECTIONS - config.keys()
+    if missing_sections:
+        missing_str = '、'.join(sorted(missing_sections))
+        logger.error(f"配置中缺少{missing_str}部分")
+        raise ValueError(f"配置中缺少{missing_str}部分")
     
     # 验证源FTP配置
     prepare_ftp_connection(config, 'source')
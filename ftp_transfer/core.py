@@ -1,29 +1,38 @@
+import json
 import os
-import sys
-import traceback
-import os
-from datetime import datetime, timedelta
-import ftplib  # 新增：导入ftplib模块
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+import fnmatch
 import re  # 新增：导入re库以支持正则表达式匹配
 from typing import List, Tuple, Dict, Optional, Any
 from loguru import logger
 
+# traceback只在异常路径使用，在使用处按需导入，加快冷启动
+
 from ftp_transfer.utils import parse_time_value_str
 
 from .config import load_config, create_config
-from .config_utils import DEFAULT_CONFIG_PATH, _ensure_directory_exists, generate_trace_id, generate_archive_dir
-from .notification import send_email_notification
+from .config_utils import (
+    DEFAULT_CONFIG_PATH,
+    STAT_CACHE_PATH,
+    _ensure_directory_exists,
+    generate_trace_id,
+    generate_archive_dir,
+)
+from .notification import send_email_notification_async
 from .logger import set_trace_id, setup_logger
 from .ftp_operations import (
     connect_ftp,
     connect_sftp,
     get_file_list,
     get_sftp_file_list,
-    download_file,
-    sftp_download_file,
-    upload_file,
-    sftp_upload_file,
     move_remote_file,
+    pipe_transfer,
+    relay_transfer,
+    release_ftp,
     sftp_move_remote_file,
     file_exists,
     sftp_file_exists,
@@ -31,9 +40,72 @@ from .ftp_operations import (
     get_file_modification_time,  # 新增：导入获取文件修改时间的函数
     get_file_creation_time,  # 新增：导入获取文件创建时间的函数
     get_sftp_file_info,  # 新增：导入获取SFTP文件信息的函数
+    batch_file_times,
+    sftp_batch_file_times,
 )
 from . import __version__, __author__, __email__
 
+@dataclass(slots=True)
+class _EndpointConfig:
+    """
+    单个服务器端点的配置，从配置字典一次性解析
+
+    slots避免每实例的__dict__开销，同时把__init__中
+    约25次链式config.get(...)查找收敛为一次构造
+    """
+    host: str = ''
+    port: int = 21
+    user: str = ''
+    password: str = ''
+    directory: str = ''
+    encoding: str = 'utf-8'
+    use_ftps: bool = False
+    tls_implicit: bool = False
+    use_passive: bool = True
+    use_sftp: bool = False
+    key_file: Optional[str] = None
+    passphrase: Optional[str] = None
+    blocksize: int = 1 << 20
+    enable_backup: bool = True
+    backup_directory: str = ''
+    file_exists_strategy: str = 'rename'
+    # 为True时上传一律使用时间戳重命名，无需探测目标文件是否存在
+    always_rename: bool = False
+
+    @classmethod
+    def from_dict(cls, cfg: Dict[str, Any]) -> '_EndpointConfig':
+        """忽略未知键（如file_filter），只取数据类声明的字段"""
+        known = {k: v for k, v in cfg.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+# HTML转义表：str.translate按C层查表转义，比逐值调用html.escape更快，
+# 同时修复文件名/错误信息原样插入HTML的问题
+_HTML_ESC = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# HTML邮件正文的固定头部（文档类型+样式），无需每次拼装
+_EMAIL_HTML_HEAD = (
+    "<!DOCTYPE html>"
+    "<html><head>"
+    "<meta charset='UTF-8'>"
+    "<style>"
+    "table {border-collapse: collapse; width: 100%;}"
+    "th, td {border: 1px solid #ddd; padding: 8px; text-align: left;}"
+    "th {background-color: #f2f2f2;}"
+    "tr:nth-child(even) {background-color: #f9f9f9;}"
+    ".success {color: green;}"
+    ".error {color: red;}"
+    ".warning {color: orange;}"
+    "</style>"
+    "</head><body>"
+)
+
 class FTPTransfer:
     def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
         """
@@ -55,7 +127,28 @@ class FTPTransfer:
         
         # 加载配置
         self.config = load_config(config_path)
-        
+
+        self._init_from_config()
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'FTPTransfer':
+        """从已解析的配置字典直接构建实例
+
+        跳过配置文件的存在性检查与YAML解析，适合配置来自上层系统
+        或测试场景（无需把字典序列化到磁盘再读回）
+
+        :param config: 配置字典，结构与配置文件一致
+        :return: FTPTransfer实例
+        """
+        self = cls.__new__(cls)
+        self.trace_id = generate_trace_id()
+        set_trace_id(self.trace_id)
+        self.config = config
+        self._init_from_config()
+        return self
+
+    def _init_from_config(self) -> None:
+        """根据self.config完成剩余初始化（日志、端点、状态容器）"""
         # 初始化日志（在设置trace_id和加载配置后进行）
         log_config = self.config.get('log', {})
         log_file = log_config.get('file', 'ftp_transfer.log')
@@ -64,58 +157,40 @@ class FTPTransfer:
         log_level = log_config.get('level', 'INFO')
         
         # 保存日志路径作为实例变量，用于后续展示
+        # 绝对路径只规范化一次，邮件正文和日志输出直接复用
         self.log_file = log_file
+        self._log_file_abs = os.path.abspath(log_file)
         
         # 使用setup_logger函数配置日志
         setup_logger(log_file, log_rotation, log_retention, log_level)
         
         logger.info("开始FTP传输任务")
-        logger.info(f"日志文件路径: {os.path.abspath(self.log_file)}")
+        logger.info(f"日志文件路径: {self._log_file_abs}")
         
-        # 提取配置参数
+        # 提取配置参数：各端点配置一次性解析进slots数据类
         source_config = self.config.get('source', {})
-        self.source_host = source_config.get('host', '')
-        self.source_port = source_config.get('port', 21)  # 获取端口，默认21
-        self.source_user = source_config.get('user', '')
-        self.source_pass = source_config.get('password', '')
-        self.source_dir = source_config.get('directory', '')
-        self.source_backup_dir = source_config.get('backup_directory', '')
-        self.source_enable_backup = source_config.get('enable_backup', True)  # 新增：备份功能开关，默认开启
-        self.source_encoding = source_config.get('encoding', 'utf-8')
-        # FTPS相关配置
-        self.source_use_ftps = source_config.get('use_ftps', False)
-        self.source_tls_implicit = source_config.get('tls_implicit', False)
-        self.source_use_passive = source_config.get('use_passive', True)
-        # SFTP相关配置
-        self.source_use_sftp = source_config.get('use_sftp', False)
-        self.source_key_file = source_config.get('key_file', None)
-        self.source_passphrase = source_config.get('passphrase', None)
+        self.src = _EndpointConfig.from_dict(source_config)
         # 文件过滤配置
         self.file_filter = source_config.get('file_filter', {})
-        
-        
-        destination_config = self.config.get('destination', {})
-        self.dest_host = destination_config.get('host', '')
-        self.dest_port = destination_config.get('port', 21)  # 获取端口，默认21
-        self.dest_user = destination_config.get('user', '')
-        self.dest_pass = destination_config.get('password', '')
-        self.dest_dir = destination_config.get('directory', '')
-        self.dest_encoding = destination_config.get('encoding', 'utf-8')
-        # FTPS相关配置
-        self.dest_use_ftps = destination_config.get('use_ftps', False)
-        self.dest_tls_implicit = destination_config.get('tls_implicit', False)
-        self.dest_use_passive = destination_config.get('use_passive', True)
-        # SFTP相关配置
-        self.dest_use_sftp = destination_config.get('use_sftp', False)
-        self.dest_key_file = destination_config.get('key_file', None)
-        self.dest_passphrase = destination_config.get('passphrase', None)
-        # 目标文件存在处理策略
-        self.file_exists_strategy = destination_config.get('file_exists_strategy', 'rename')
+
+        self.dst = _EndpointConfig.from_dict(self.config.get('destination', {}))
+
+        # 协议组合自初始化起不再变化：提前绑定流式传输与备份移动的实现，
+        # 每个文件省去重复的use_sftp分支判断
+        if not self.src.use_sftp and not self.dst.use_sftp:
+            self._stream_one = self._stream_ftp_pipe
+        else:
+            self._stream_one = self._stream_sftp_relay
+        self._move_backup = self._move_backup_sftp if self.src.use_sftp else self._move_backup_ftp
         
         # 邮件配置
         self.email_config = self.config.get('email', {})
         self.email_enable = self.email_config.get('enable', False)
         self.failure_threshold = self.email_config.get('failure_threshold', 3)
+
+        # 并发传输数（传输是网络往返延迟主导的，多个连接并行可接近线性加速）
+        # concurrency=1时保持原有串行逻辑
+        self.concurrency = int(self.config.get('concurrency', 4))
         
         # 自动生成存档目录，无需配置
         self.archive_dir = generate_archive_dir()
@@ -125,25 +200,116 @@ class FTPTransfer:
         self.success_files = []
         self.skipped_files = []
         self.failed_files = {}  # {文件名: 失败原因}
+        self.renamed_files = {}  # {原文件名: 实际上传文件名}
         self.errors = []
+        # 目标目录预取列表（transfer_files开始时填充，None表示逐文件探测）
+        self._dest_listing = None
+        # 本批次重命名用的时间戳（transfer_files开始时格式化一次）
+        self._batch_timestamp = None
+        # 并发传输时保护上述结果容器的锁
+        self._results_lock = threading.Lock()
+
+        # 跨运行的远端文件时间缓存：{服务器键: {文件名: ISO时间}}
+        # 源文件处理成功后会被移出源目录，留在目录里的旧文件时间通常不变，
+        # 缓存命中即可省去对它们的逐文件时间探测
+        self._stat_cache_key = f"{self.src.host}:{self.src.port}{self.src.directory}"
+        self._stat_cache = self._load_stat_cache()
         
         # 确保存档目录存在
         _ensure_directory_exists(self.archive_dir)
         
         logger.info("FTP传输工具初始化完成")
 
+    @property
+    def source_host(self) -> str:
+        """兼容旧的扁平属性访问（测试及外部脚本使用）"""
+        return self.src.host
+
+    @property
+    def dest_host(self) -> str:
+        """兼容旧的扁平属性访问（测试及外部脚本使用）"""
+        return self.dst.host
+
+    def _connect_source(self):
+        """建立一个到源服务器的连接（根据配置选择SFTP或FTP）"""
+        if self.src.use_sftp:
+            return connect_sftp(
+                self.src.host,
+                self.src.user,
+                self.src.password,
+                self.src.port,
+                self.src.key_file,
+                self.src.passphrase
+            )
+        return connect_ftp(
+            self.src.host,
+            self.src.user,
+            self.src.password,
+            self.src.port,
+            self.src.encoding,
+            use_ftps=self.src.use_ftps,
+            tls_implicit=self.src.tls_implicit,
+            use_passive=self.src.use_passive,
+        )
+
+    def _connect_dest(self):
+        """建立一个到目标服务器的连接（根据配置选择SFTP或FTP）"""
+        if self.dst.use_sftp:
+            return connect_sftp(
+                self.dst.host,
+                self.dst.user,
+                self.dst.password,
+                self.dst.port,
+                self.dst.key_file,
+                self.dst.passphrase
+            )
+        return connect_ftp(
+            self.dst.host,
+            self.dst.user,
+            self.dst.password,
+            self.dst.port,
+            self.dst.encoding,
+            use_ftps=self.dst.use_ftps,
+            tls_implicit=self.dst.tls_implicit,
+            use_passive=self.dst.use_passive,
+        )
+
+    @staticmethod
+    def _close_conn(conn, use_sftp: bool) -> None:
+        """释放一个源/目标连接：FTP连接归还连接池，SFTP连接直接关闭"""
+        try:
+            if use_sftp:
+                close_sftp(conn)
+            else:
+                release_ftp(conn)
+        except Exception as e:
+            logger.warning(f"释放连接时出错: {str(e)}")
+
     def _generate_timestamped_filename(self, filename: str) -> str:
-        """生成带时间戳的文件名，格式为 旧文件名_年月日时分秒.后缀"""
+        """生成带时间戳的文件名，格式为 旧文件名_年月日时分秒.后缀
+
+        同一批次的文件复用transfer_files开始时格式化好的时间戳，
+        避免每个文件各执行一次strftime
+        """
         base_name, ext = os.path.splitext(filename)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        return f"{base_name}_{timestamp}{ext}"
+        timestamp = self._batch_timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
+        new_filename = f"{base_name}_{timestamp}{ext}"
+        # 批次共用一个时间戳，生成的名字可能撞上目标目录已有文件
+        # （例如上次运行同秒生成的遗留文件），用递增序号避开
+        if self._dest_listing is not None:
+            counter = 1
+            while new_filename in self._dest_listing:
+                new_filename = f"{base_name}_{timestamp}_{counter}{ext}"
+                counter += 1
+        return new_filename
 
-    def _filter_files(self, file_list: List[str], file_filter: Dict) -> List[str]:
+    def _filter_files(self, file_list: List[str], file_filter: Dict, source_conn=None) -> List[str]:
         """
         根据文件过滤规则过滤文件列表
         
         :param file_list: 原始文件列表
         :param file_filter: 文件过滤规则配置
+        :param source_conn: 已建立的源服务器连接（时间过滤时复用，不再单独建连）
         :return: 过滤后的文件列表
         """
         if not file_filter or file_filter.get('type') == 'all':
@@ -152,103 +318,143 @@ class FTPTransfer:
         filtered_files = []
         filter_type = file_filter.get('type', 'all')
         
-        # 连接到源服务器以获取文件时间信息（如果需要）
-        source_conn = None
         need_file_info = filter_type in ['creation_time', 'modification_time']
         
-        try:
-            if need_file_info:
-                if self.source_use_sftp:
-                    # 使用SFTP连接
-                    source_conn = connect_sftp(
-                        self.source_host,
-                        self.source_user,
-                        self.source_pass,
-                        self.source_port,
-                        self.source_key_file,
-                        self.source_passphrase
-                    )
-                else:
-                    # 使用FTP连接
-                    source_conn = connect_ftp(
-                        self.source_host,
-                        self.source_user,
-                        self.source_pass,
-                        self.source_port,
-                        self.source_encoding,
-                        use_ftps=self.source_use_ftps,
-                        tls_implicit=self.source_tls_implicit,
-                        use_passive=self.source_use_passive,
-                    )
-            
-            for filename in file_list:
-                if filter_type == 'pattern':
-                    # 字符匹配文件名
-                    pattern = file_filter.get('pattern', '')
-                    # 将通配符转换为正则表达式
-                    regex_pattern = pattern.replace('.', '\\.').replace('*', '.*').replace('?', '.')
-                    if re.search(regex_pattern, filename):
-                        filtered_files.append(filename)
-                elif filter_type == 'extension':
-                    # 文件后缀匹配
-                    extensions = file_filter.get('extensions', [])
-                    file_ext = filename.split('.')[-1].lower() if '.' in filename else ''
-                    if any(ext.lower() == file_ext for ext in extensions):
-                        filtered_files.append(filename)
-                elif filter_type in ['creation_time', 'modification_time']:
-                    # 时间过滤
-                    try:
-                        time_value_str = file_filter.get('time_value', [])
-                        time_type = file_filter.get('time_type', 'since')
-                        logger.info(f"文件过滤规则: 类型={filter_type}, 值={time_value_str}, 类型={time_type}")
-
-                        time_value_str = 'current_time' if time_value_str == '' else time_value_str
-                        if not isinstance(time_value_str, list):
-                            time_value_str = [time_value_str]
-                        filter_times = [parse_time_value_str(value) for value in time_value_str]
-                        
-                        # 获取文件时间
-                        file_time = None
-                        if self.source_use_sftp and source_conn:
-                            file_info = get_sftp_file_info(source_conn, self.source_dir, filename)
-                            if file_info:
-                                if filter_type == 'modification_time':
-                                    file_time = file_info['modified_time']
-                                else:
-                                    file_time = file_info['created_time']
-                        elif not self.source_use_sftp and source_conn:
+        # 循环不变量提前到循环外：模式正则只编译一次，后缀表建成frozenset做O(1)查找
+        pattern_re = None
+        ext_set = None
+        if filter_type == 'pattern':
+            pattern = file_filter.get('pattern', '')
+            # fnmatch.translate做完整的通配符->正则转换：
+            # 手写replace链会把*.log错翻成.*\.log（匹配任意含.log的名字），
+            # 且无法处理[seq]等语法；translate生成锚定全名的正则
+            pattern_re = re.compile(fnmatch.translate(pattern))
+        elif filter_type == 'extension':
+            ext_set = frozenset(ext.lower() for ext in file_filter.get('extensions', []))
+        filter_times = None
+        if need_file_info:
+            time_value_str = file_filter.get('time_value', [])
+            time_type = file_filter.get('time_type', 'since')
+            logger.info(f"文件过滤规则: 类型={filter_type}, 值={time_value_str}, 类型={time_type}")
+            time_value_str = 'current_time' if time_value_str == '' else time_value_str
+            if not isinstance(time_value_str, list):
+                time_value_str = [time_value_str]
+            filter_times = [parse_time_value_str(value) for value in time_value_str]
+
+        # 批量时间表：一次列表请求拿到整目录的时间信息，替代逐文件往返
+        time_lookup = None
+        # 修改时间过滤可用跨运行缓存兜底，避免对旧文件反复逐个探测
+        cache_bucket = None
+        if filter_type == 'modification_time':
+            cache_bucket = self._stat_cache.setdefault(self._stat_cache_key, {})
+
+        # 时间过滤直接复用调用方已建立的源连接，
+        # 省去一次额外的TCP握手和TLS/SSH协商
+        if need_file_info and source_conn is not None:
+            if self.src.use_sftp:
+                time_lookup = sftp_batch_file_times(source_conn, self.src.directory)
+            else:
+                time_lookup = batch_file_times(source_conn, self.src.directory)
+
+        for filename in file_list:
+            if filter_type == 'pattern':
+                # 字符匹配文件名（translate的结果自带锚定，用match即可）
+                if pattern_re.match(filename):
+                    filtered_files.append(filename)
+            elif filter_type == 'extension':
+                # 文件后缀匹配
+                file_ext = filename.rpartition('.')[2].lower() if '.' in filename else ''
+                if file_ext in ext_set:
+                    filtered_files.append(filename)
+            elif filter_type in ['creation_time', 'modification_time']:
+                # 时间过滤
+                try:
+                    # 获取文件时间：优先使用批量时间表，缺失时回退逐文件查询
+                    file_time = None
+                    if time_lookup is not None:
+                        file_info = time_lookup.get(filename)
+                        if file_info:
                             if filter_type == 'modification_time':
-                                file_time = get_file_modification_time(source_conn, self.source_dir, filename)
-                            elif filter_type == 'creation_time':
-                                file_time = get_file_creation_time(source_conn, self.source_dir, filename)
-                        
-                        # 比较时间
-                        if file_time:
-                            logger.info(f"文件 {filename} 的时间为: {file_time} {filter_times} {time_type}")
-                            if file_time < filter_times[0]:
-                                if filter_times[1]:
-                                    if file_time > filter_times[1]:
-                                        filtered_files.append(filename)
-                                else:
+                                file_time = file_info['modified_time']
+                            else:
+                                file_time = file_info['created_time']
+                    if file_time is None and cache_bucket is not None:
+                        cached = cache_bucket.get(filename)
+                        if cached:
+                            file_time = datetime.fromisoformat(cached)
+                    if file_time is None and self.src.use_sftp and source_conn:
+                        file_info = get_sftp_file_info(source_conn, self.src.directory, filename)
+                        if file_info:
+                            if filter_type == 'modification_time':
+                                file_time = file_info['modified_time']
+                            else:
+                                file_time = file_info['created_time']
+                    elif file_time is None and not self.src.use_sftp and source_conn:
+                        if filter_type == 'modification_time':
+                            file_time = get_file_modification_time(source_conn, self.src.directory, filename)
+                        elif filter_type == 'creation_time':
+                            file_time = get_file_creation_time(source_conn, self.src.directory, filename)
+                    if file_time is not None and cache_bucket is not None:
+                        cache_bucket[filename] = file_time.isoformat()
+                    
+                    # 比较时间
+                    if file_time:
+                        logger.info(f"文件 {filename} 的时间为: {file_time} {filter_times} {time_type}")
+                        if file_time < filter_times[0]:
+                            if filter_times[1]:
+                                if file_time > filter_times[1]:
                                     filtered_files.append(filename)
-                    except Exception as e:
-                        logger.warning(f"处理文件 {filename} 的时间信息时出错: {str(e)}")
-            
-            return filtered_files
-        finally:
-            # 关闭连接
-            if need_file_info:
-                if self.source_use_sftp and source_conn:
-                    close_sftp(source_conn)
-                elif not self.source_use_sftp and source_conn:
-                    source_conn.quit()
+                            else:
+                                filtered_files.append(filename)
+                except Exception as e:
+                    logger.warning(f"处理文件 {filename} 的时间信息时出错: {str(e)}")
+
+        return filtered_files
+
+    @staticmethod
+    def _load_stat_cache() -> Dict:
+        """加载跨运行的文件时间缓存，文件缺失或损坏时返回空缓存"""
+        try:
+            with open(STAT_CACHE_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stat_cache(self) -> None:
+        """原子写回文件时间缓存（先写临时文件再os.replace，避免半写状态）"""
+        try:
+            _ensure_directory_exists(os.path.dirname(STAT_CACHE_PATH))
+            tmp_path = STAT_CACHE_PATH + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._stat_cache, f, ensure_ascii=False)
+            os.replace(tmp_path, STAT_CACHE_PATH)
+        except Exception as e:
+            logger.warning(f"写回文件时间缓存失败: {str(e)}")
+
+    def _stats(self) -> Tuple[int, int, int, int]:
+        """汇总一次各结果容器的数量：(总数, 成功, 跳过, 失败)"""
+        return (
+            len(self.found_files),
+            len(self.success_files),
+            len(self.skipped_files),
+            len(self.failed_files),
+        )
+
+    def _notify(self) -> None:
+        """构建并发送邮件通知
+
+        邮件未启用时直接返回，HTML正文的拼装（与文件数成正比）完全跳过
+        """
+        if not self.email_enable:
+            logger.info("邮件通知已禁用，跳过邮件内容生成")
+            return
+        subject, body, is_html = self._prepare_email_content()
+        # 后台线程发送，传输收尾（连接清理等）与SMTP往返重叠进行
+        send_email_notification_async(self.email_config, subject, body, is_html)
 
     def _prepare_email_content(self) -> Tuple[str, str, bool]:
         """准备邮件主题和内容"""
-        total_files = len(self.found_files)
-        success_count = len(self.success_files)
-        skipped_count = len(self.skipped_files)
-        failed_count = len(self.failed_files)
+        total_files, success_count, skipped_count, failed_count = self._stats()
         
         # 确定邮件主题前缀
         if self.errors:
@@ -268,153 +474,307 @@ class FTPTransfer:
         base_subject = self.email_config.get('subject', "FTP文件传输任务报告")
         subject = f"{subject_prefix} {base_subject}" if subject_prefix else base_subject
         
-        # 构建HTML格式的邮件正文
-        html_body_parts = []
-        html_body_parts.append("<!DOCTYPE html>")
-        html_body_parts.append("<html><head>")
-        html_body_parts.append("<meta charset='UTF-8'>")
-        html_body_parts.append("<style>")
-        html_body_parts.append("table {border-collapse: collapse; width: 100%;}")
-        html_body_parts.append("th, td {border: 1px solid #ddd; padding: 8px; text-align: left;}")
-        html_body_parts.append("th {background-color: #f2f2f2;}")
-        html_body_parts.append("tr:nth-child(even) {background-color: #f9f9f9;}")
-        html_body_parts.append(".success {color: green;}")
-        html_body_parts.append(".error {color: red;}")
-        html_body_parts.append(".warning {color: orange;}")
-        html_body_parts.append("</style>")
-        html_body_parts.append("</head><body>")
-        
-        # 添加总体状态
-        html_body_parts.append("<h2>FTP文件传输任务执行结果</h2>")
-        html_body_parts.append("<table>")
-        html_body_parts.append("<tr><th>项目</th><th>数量</th></tr>")
-        html_body_parts.append(f"<tr><td>总文件数</td><td>{total_files}</td></tr>")
-        html_body_parts.append(f"<tr><td>成功传输</td><td><span class='success'>{success_count}</span></td></tr>")
-        html_body_parts.append(f"<tr><td>跳过文件</td><td>{skipped_count}</td></tr>")
-        html_body_parts.append(f"<tr><td>失败文件</td><td><span class='error'>{failed_count}</span></td></tr>")
-        html_body_parts.append("</table><br>")
-        
-        # 添加找到的文件列表表格
-        html_body_parts.append("<h3>找到的文件列表</h3>")
+        # 构建HTML格式的邮件正文：逐段生成+一次join拼接，
+        # 避免数百次append调用并且不保留中间片段列表
+        # （此前同时组装的纯文本正文从未被使用，不再构建）
+        body = "".join(self._html_chunks(total_files, success_count, skipped_count, failed_count))
+
+        # 返回HTML正文和is_html=True，notification.py会处理纯文本部分
+        return subject, body, True
+
+    def _html_chunks(self, total_files: int, success_count: int, skipped_count: int, failed_count: int):
+        """逐段生成HTML邮件正文，由_prepare_email_content一次join拼接"""
+        yield _EMAIL_HTML_HEAD
+
+        # 总体状态
+        yield "<h2>FTP文件传输任务执行结果</h2>"
+        yield "<table>"
+        yield "<tr><th>项目</th><th>数量</th></tr>"
+        yield f"<tr><td>总文件数</td><td>{total_files}</td></tr>"
+        yield f"<tr><td>成功传输</td><td><span class='success'>{success_count}</span></td></tr>"
+        yield f"<tr><td>跳过文件</td><td>{skipped_count}</td></tr>"
+        yield f"<tr><td>失败文件</td><td><span class='error'>{failed_count}</span></td></tr>"
+        yield "</table><br>"
+
+        # 找到的文件列表
+        yield "<h3>找到的文件列表</h3>"
         if self.found_files:
-            html_body_parts.append("<table>")
-            html_body_parts.append("<tr><th>文件名称</th></tr>")
-            for file in self.found_files:
-                html_body_parts.append(f"<tr><td>{file}</td></tr>")
-            html_body_parts.append("</table>")
+            yield "<table><tr><th>文件名称</th></tr>"
+            yield "".join(f"<tr><td>{file.translate(_HTML_ESC)}</td></tr>" for file in self.found_files)
+            yield "</table>"
         else:
-            html_body_parts.append("<p>无</p>")
-        html_body_parts.append("<br>")
-        
-        # 添加重命名的文件表格
-        if hasattr(self, 'renamed_files') and self.renamed_files:
-            html_body_parts.append("<h3>重命名的文件 (目标已存在)</h3>")
-            html_body_parts.append("<table>")
-            html_body_parts.append("<tr><th>原文件名</th><th>实际上传文件名</th></tr>")
-            for original_name, new_name in self.renamed_files.items():
-                html_body_parts.append(f"<tr><td>{original_name}</td><td><span class='warning'>{new_name}</span></td></tr>")
-            html_body_parts.append("</table>")
-            html_body_parts.append("<br>")
-        
-        # 添加成功的文件表格
-        if self.success_files:
-            html_body_parts.append("<h3>成功传输的文件</h3>")
-            html_body_parts.append("<table>")
-            html_body_parts.append("<tr><th>文件名称</th></tr>")
-            for file in self.success_files:
-                html_body_parts.append(f"<tr><td><span class='success'>{file}</span></td></tr>")
-            html_body_parts.append("</table>")
-            html_body_parts.append("<br>")
-        
-        # 显示根据文件存在策略跳过的文件
-        if self.skipped_files:
-            html_body_parts.append("<h3>跳过的文件</h3>")
-            html_body_parts.append("<table>")
-            html_body_parts.append("<tr><th>文件名称</th></tr>")
-            for file in self.skipped_files:
-                html_body_parts.append(f"<tr><td>{file}</td></tr>")
-            html_body_parts.append("</table>")
-            html_body_parts.append("<br>")
-        
-        # 添加失败的文件及原因表格
-        if self.failed_files:
-            html_body_parts.append("<h3>失败的文件及原因</h3>")
-            html_body_parts.append("<table>")
-            html_body_parts.append("<tr><th>文件名称</th><th>失败原因</th></tr>")
-            for file, reason in self.failed_files.items():
-                html_body_parts.append(f"<tr><td><span class='error'>{file}</span></td><td>{reason}</td></tr>")
-            html_body_parts.append("</table>")
-            html_body_parts.append("<br>")
-        
-        # 添加错误信息
-        if self.errors:
-            html_body_parts.append("<h3>错误信息</h3>")
-            html_body_parts.append("<ul>")
-            for error in self.errors:
-                html_body_parts.append(f"<li class='error'>{error}</li>")
-            html_body_parts.append("</ul>")
-            html_body_parts.append("<br>")
-        
-        html_body_parts.append("<p>详细日志请查看日志文件。</p>")
-        html_body_parts.append("<hr>")
-        html_body_parts.append(f"<p><strong>运行信息：</strong></p>")
-        html_body_parts.append(f"<p>• 日志文件路径: {os.path.abspath(self.log_file)}</p>")
-        html_body_parts.append(f"<p>• 运行追踪ID: {self.trace_id}</p>")
-        html_body_parts.append("</body></html>")
-        
-        # 构建纯文本格式的邮件正文（用于不支持HTML的邮件客户端）
-        plain_body_parts = []
-        plain_body_parts.append("FTP文件传输任务执行结果如下：")
-        plain_body_parts.append(f"总文件数: {total_files}")
-        plain_body_parts.append(f"成功传输: {success_count}")
-        plain_body_parts.append(f"跳过文件: {skipped_count}")
-        plain_body_parts.append(f"失败文件: {failed_count}")
-        plain_body_parts.append("")
-        
-        # 添加找到的文件列表
-        plain_body_parts.append("找到的文件列表:")
-        plain_body_parts.append("\n".join([f"- {f}" for f in self.found_files]) or "无")
-        plain_body_parts.append("")
-        
-        # 添加重命名的文件
-        if hasattr(self, 'renamed_files') and self.renamed_files:
-            plain_body_parts.append("重命名的文件 (目标已存在):")
-            for original_name, new_name in self.renamed_files.items():
-                plain_body_parts.append(f"- {original_name} -> {new_name}")
-            plain_body_parts.append("")
-        
-        # 添加成功的文件
+            yield "<p>无</p>"
+        yield "<br>"
+
+        # 重命名的文件
+        if self.renamed_files:
+            yield "<h3>重命名的文件 (目标已存在)</h3>"
+            yield "<table><tr><th>原文件名</th><th>实际上传文件名</th></tr>"
+            yield "".join(
+                f"<tr><td>{original_name.translate(_HTML_ESC)}</td>"
+                f"<td><span class='warning'>{new_name.translate(_HTML_ESC)}</span></td></tr>"
+                for original_name, new_name in self.renamed_files.items()
+            )
+            yield "</table><br>"
+
+        # 成功的文件
         if self.success_files:
-            plain_body_parts.append("成功传输的文件:")
-            plain_body_parts.append("\n".join([f"- {f}" for f in self.success_files]))
-            plain_body_parts.append("")
-        
-        # 显示根据文件存在策略跳过的文件
+            yield "<h3>成功传输的文件</h3>"
+            yield "<table><tr><th>文件名称</th></tr>"
+            yield "".join(f"<tr><td><span class='success'>{file.translate(_HTML_ESC)}</span></td></tr>" for file in self.success_files)
+            yield "</table><br>"
+
+        # 根据文件存在策略跳过的文件
         if self.skipped_files:
-            plain_body_parts.append("跳过的文件:")
-            plain_body_parts.append("\n".join([f"- {f}" for f in self.skipped_files]))
-            plain_body_parts.append("")
-        
-        # 添加失败的文件及原因
+            yield "<h3>跳过的文件</h3>"
+            yield "<table><tr><th>文件名称</th></tr>"
+            yield "".join(f"<tr><td>{file.translate(_HTML_ESC)}</td></tr>" for file in self.skipped_files)
+            yield "</table><br>"
+
+        # 失败的文件及原因
         if self.failed_files:
-            plain_body_parts.append("失败的文件及原因:")
-            for file, reason in self.failed_files.items():
-                plain_body_parts.append(f"- {file}: {reason}")
-            plain_body_parts.append("")
-        
-        # 添加错误信息
+            yield "<h3>失败的文件及原因</h3>"
+            yield "<table><tr><th>文件名称</th><th>失败原因</th></tr>"
+            yield "".join(
+                f"<tr><td><span class='error'>{file.translate(_HTML_ESC)}</span></td>"
+                f"<td>{str(reason).translate(_HTML_ESC)}</td></tr>"
+                for file, reason in self.failed_files.items()
+            )
+            yield "</table><br>"
+
+        # 错误信息
         if self.errors:
-            plain_body_parts.append("错误信息:")
-            plain_body_parts.append("\n".join([f"- {e}" for e in self.errors]))
-            plain_body_parts.append("")
-        plain_body_parts.append("详细日志请查看日志文件。")
-        plain_body_parts.append("")
-        plain_body_parts.append("运行信息：")
-        plain_body_parts.append(f"• 日志文件路径: {os.path.abspath(self.log_file)}")
-        plain_body_parts.append(f"• 运行追踪ID: {self.trace_id}")
-        
-        # 返回HTML正文和is_html=True，notification.py会处理纯文本部分
-        return subject, "".join(html_body_parts), True
+            yield "<h3>错误信息</h3>"
+            yield "<ul>"
+            yield "".join(f"<li class='error'>{str(error).translate(_HTML_ESC)}</li>" for error in self.errors)
+            yield "</ul><br>"
+
+        yield "<p>详细日志请查看日志文件。</p>"
+        yield "<hr>"
+        yield "<p><strong>运行信息：</strong></p>"
+        yield f"<p>• 日志文件路径: {self._log_file_abs}</p>"
+        yield f"<p>• 运行追踪ID: {self.trace_id}</p>"
+        yield "</body></html>"
+
+    def _fetch_dest_listing(self, dest_conn) -> Optional[set]:
+        """
+        一次性获取目标目录的文件名集合，用于批量存在性检查
+
+        把逐文件一次往返的exists探测合并为一次列目录请求；
+        获取失败时返回None，处理时回退为逐文件探测
+
+        :param dest_conn: 目标服务器连接
+        :return: 文件名集合，失败时为None
+        """
+        try:
+            if self.dst.use_sftp:
+                listing = set(dest_conn.listdir(self.dst.directory))
+            else:
+                # 调用方已将连接切换到目标目录，此处直接列表
+                listing = set(dest_conn.nlst())
+            logger.info(f"预取目标目录列表: {self.dst.directory} 共 {len(listing)} 项")
+            return listing
+        except Exception as e:
+            logger.warning(f"预取目标目录列表失败，回退为逐文件检查: {str(e)}")
+            return None
+
+    def _process_one(self, filename: str, source_conn, dest_conn) -> None:
+        """
+        处理单个文件的完整流程：存在检查、下载、上传、备份、清理
+
+        并发执行时每个工作线程持有独立的源/目标连接；
+        对结果容器的修改统一在_results_lock保护下进行
+
+        :param filename: 待处理的文件名
+        :param source_conn: 源服务器连接
+        :param dest_conn: 目标服务器连接
+        """
+        # 逐文件热路径日志统一使用loguru占位符，仅在记录真正被输出时才格式化
+        logger.info("处理文件: {}", filename)
+
+        upload_filename = self._resolve_upload_name(filename, dest_conn)
+        if upload_filename is None:
+            return
+
+        # 源→目标直接流式中转，不经本地临时文件：
+        # 省去每个字节一次磁盘写入+读回，下载与上传在单个文件内自然重叠
+        # （具体实现已在__init__按协议组合绑定）
+        if not self._stream_one(filename, upload_filename, source_conn, dest_conn):
+            with self._results_lock:
+                self.failed_files[filename] = "流式传输失败"
+            return
+
+        self._backup_and_record(filename, upload_filename, source_conn)
+
+    def _stream_ftp_pipe(self, filename: str, upload_filename: str, source_conn, dest_conn) -> bool:
+        """两端均为FTP/FTPS：STOR数据通道直接接收RETR数据块"""
+        return pipe_transfer(source_conn, filename, dest_conn, upload_filename, blocksize=self.src.blocksize)
+
+    def _stream_sftp_relay(self, filename: str, upload_filename: str, source_conn, dest_conn) -> bool:
+        """涉及SFTP的组合：经paramiko文件句柄流式中转"""
+        return relay_transfer(
+            source_conn, self.src.use_sftp, self.src.directory, filename,
+            dest_conn, self.dst.use_sftp, self.dst.directory, upload_filename,
+            blocksize=self.src.blocksize,
+        )
+
+    def _move_backup_sftp(self, source_conn, filename: str, upload_filename: str) -> bool:
+        """SFTP源的备份移动实现"""
+        return sftp_move_remote_file(source_conn, filename, upload_filename, self.src.directory, self.src.backup_directory)
+
+    def _move_backup_ftp(self, source_conn, filename: str, upload_filename: str) -> bool:
+        """FTP源的备份移动实现"""
+        return move_remote_file(source_conn, filename, self.src.backup_directory + '/' + upload_filename)
+
+    def _resolve_upload_name(self, filename: str, dest_conn) -> Optional[str]:
+        """
+        根据文件存在策略决定实际上传文件名
+
+        :param filename: 源文件名
+        :param dest_conn: 目标服务器连接（列表预取失败时用于逐文件探测）
+        :return: 上传文件名，返回None表示按策略跳过该文件
+        """
+        # 配置为一律重命名时，存在性探测纯属往返浪费，直接生成新文件名
+        if self.dst.always_rename:
+            new_filename = self._generate_timestamped_filename(filename)
+            logger.info(f"已配置always_rename，文件 {filename} 将重命名为 {new_filename} 上传")
+            with self._results_lock:
+                self.renamed_files[filename] = new_filename
+            return new_filename
+
+        # 检查目标服务器是否已存在该文件
+        # 优先使用预取的目录列表（零额外往返），预取失败时回退为逐文件探测
+        if self._dest_listing is not None:
+            file_already_exists = filename in self._dest_listing
+        elif self.dst.use_sftp:
+            file_already_exists = sftp_file_exists(dest_conn, self.dst.directory, filename)
+        else:
+            file_already_exists = file_exists(dest_conn, self.dst.directory, filename)
+
+        if not file_already_exists:
+            # 上传后目标目录即出现该文件名，同步进预取列表，
+            # 批次内再出现同名文件时无需真实探测也能判断存在
+            if self._dest_listing is not None:
+                with self._results_lock:
+                    self._dest_listing.add(filename)
+            return filename
+
+        strategy = self.dst.file_exists_strategy.lower()
+
+        if strategy == 'skip':
+            logger.info("目标服务器中已存在文件 {}，根据策略将跳过此文件", filename)
+            with self._results_lock:
+                self.skipped_files.append(filename)
+            return None
+        if strategy == 'overwrite':
+            logger.warning("目标服务器中已存在文件 {}，根据策略将覆盖此文件", filename)
+            # 仍然使用原始文件名，覆盖已有文件
+            return filename
+        if strategy != 'rename':
+            # 默认使用重命名策略
+            logger.warning(f"未知的文件存在策略 '{strategy}'，将默认使用重命名策略")
+
+        # 生成带时间戳的新文件名
+        new_filename = self._generate_timestamped_filename(filename)
+        logger.warning("目标服务器中已存在文件 {}，根据策略将重命名为 {} 上传", filename, new_filename)
+        # 记录重命名的文件
+        with self._results_lock:
+            self.renamed_files[filename] = new_filename
+            if self._dest_listing is not None:
+                self._dest_listing.add(new_filename)
+        return new_filename
+
+    def _backup_and_record(self, filename: str, upload_filename: str, source_conn) -> None:
+        """
+        上传成功后的收尾：按配置把源文件移动到备份目录并记录结果
+
+        :param filename: 源文件名
+        :param upload_filename: 实际上传的文件名
+        :param source_conn: 源服务器连接
+        """
+        # 成功记录只构造一次：文件被重命名时记录实际上传的文件名
+        new_name = self.renamed_files.get(filename)
+        success_entry = f"{filename} -> {new_name}" if new_name else filename
+        # 移动源文件到备份目录（如果配置了备份目录且启用了备份功能）
+        if self.src.enable_backup and self.src.backup_directory:
+            logger.info("将文件 {} 移动到源服务器备份目录 {}", filename, self.src.backup_directory)
+            move_success = self._move_backup(source_conn, filename, upload_filename)
+
+            with self._results_lock:
+                if move_success:
+                    self.success_files.append(success_entry)
+                else:
+                    self.failed_files[filename] = "移动源文件到备份目录失败"
+        else:
+            if self.src.enable_backup:
+                logger.info("未配置源服务器备份目录，跳过文件 {} 的备份", filename)
+            else:
+                logger.info("源服务器备份功能已禁用，跳过文件 {} 的备份", filename)
+            with self._results_lock:
+                self.success_files.append(success_entry)
+
+    def _transfer_worker(self, filename: str, source_pool: queue.Queue, dest_pool: queue.Queue) -> None:
+        """并发传输的工作函数：从连接池借出一对连接处理单个文件后归还"""
+        src = source_pool.get()
+        dst = dest_pool.get()
+        try:
+            self._process_one(filename, src, dst)
+        except Exception as e:
+            logger.error(f"处理文件 {filename} 时发生错误: {str(e)}")
+            with self._results_lock:
+                self.failed_files[filename] = str(e)
+        finally:
+            source_pool.put(src)
+            dest_pool.put(dst)
+
+    def _transfer_parallel(self, file_list: List[str], source_conn, dest_conn, workers: int) -> None:
+        """
+        使用连接池和线程池并行处理文件列表
+
+        ftplib/paramiko的会话对象不是线程安全的，为每个并发度准备一对
+        独立的源/目标连接放入队列，任务执行时借出、结束后归还；
+        额外连接建立失败时自动降级为已有的并发度
+
+        :param file_list: 待处理的文件列表
+        :param source_conn: 已建立的源服务器连接
+        :param dest_conn: 已建立的目标服务器连接
+        :param workers: 期望的并发数
+        """
+        source_pool: queue.Queue = queue.Queue()
+        dest_pool: queue.Queue = queue.Queue()
+        source_pool.put(source_conn)
+        dest_pool.put(dest_conn)
+        extra_conns = []
+        for _ in range(workers - 1):
+            src = dst = None
+            try:
+                src = self._connect_source()
+                dst = self._connect_dest()
+                # 源/目标目录各只切换一次，处理单个文件时不再重复cwd
+                if not self.src.use_sftp:
+                    src.cwd(self.src.directory)
+                if not self.dst.use_sftp:
+                    dst.cwd(self.dst.directory)
+            except Exception as e:
+                if src is not None:
+                    self._close_conn(src, self.src.use_sftp)
+                if dst is not None:
+                    self._close_conn(dst, self.dst.use_sftp)
+                logger.warning(f"建立额外并发连接失败，降级并发度: {str(e)}")
+                break
+            extra_conns.append((src, dst))
+            source_pool.put(src)
+            dest_pool.put(dst)
+
+        try:
+            with ThreadPoolExecutor(max_workers=source_pool.qsize()) as executor:
+                for filename in file_list:
+                    executor.submit(self._transfer_worker, filename, source_pool, dest_pool)
+        finally:
+            # 只关闭额外建立的连接，主连接由transfer_files统一关闭
+            for src, dst in extra_conns:
+                self._close_conn(src, self.src.use_sftp)
+                self._close_conn(dst, self.dst.use_sftp)
 
     def transfer_files(self) -> Tuple[int, int, int, int]:
         """
@@ -422,238 +782,94 @@ class FTPTransfer:
         
         :return: 一个元组 (找到的文件数, 成功传输的文件数, 跳过的文件数, 失败的文件数)
         """
+        # 两个主连接统一在最外层finally释放：任何提前return或异常
+        # 都不会漏掉quit/close，避免服务器侧残留CLOSE_WAIT连接
+        source_conn = None
+        dest_conn = None
         try:
             # 连接到源FTP/SFTP服务器
-            source_conn = None
             try:
-                if self.source_use_sftp:
-                    # 使用SFTP连接
-                    source_conn = connect_sftp(
-                        self.source_host,
-                        self.source_user,
-                        self.source_pass,
-                        self.source_port,
-                        self.source_key_file,
-                        self.source_passphrase
-                    )
-                else:
-                    # 使用FTP连接
-                    source_conn = connect_ftp(
-                        self.source_host, 
-                        self.source_user, 
-                        self.source_pass,
-                        self.source_port,
-                        self.source_encoding,
-                        use_ftps=self.source_use_ftps,
-                        tls_implicit=self.source_tls_implicit,
-                        use_passive=self.source_use_passive,
-                    )
+                source_conn = self._connect_source()
             except Exception as e:
                 error_msg = f"连接源服务器失败: {str(e)}"
                 logger.error(error_msg)
                 self.errors.append(error_msg)
                 # 准备并发送邮件
-                subject, body, is_html = self._prepare_email_content()
-                send_email_notification(self.email_config, subject, body, is_html)
+                self._notify()
                 return (0, 0, 0, 0)
             
             # 获取源目录文件列表
-            if self.source_use_sftp:
-                file_list = get_sftp_file_list(source_conn, self.source_dir)
+            if self.src.use_sftp:
+                file_list = get_sftp_file_list(source_conn, self.src.directory)
             else:
-                file_list = get_file_list(source_conn, self.source_dir)
+                file_list = get_file_list(source_conn, self.src.directory)
             
-            if len(file_list):
-                # 应用文件过滤规则
-                if hasattr(self, 'file_filter') and self.file_filter:
-                    filtered_list = self._filter_files(file_list, self.file_filter)
-                    logger.info(f"应用文件过滤规则后，文件数量从 {len(file_list)} 减少到 {len(filtered_list)}")
-                    file_list = filtered_list
+            # 应用文件过滤规则（type为all或未配置过滤时整批直接通过，不再进函数逐项扫描）
+            if file_list and self.file_filter and self.file_filter.get('type', 'all') != 'all':
+                filtered_list = self._filter_files(file_list, self.file_filter, source_conn)
+                logger.info(f"应用文件过滤规则后，文件数量从 {len(file_list)} 减少到 {len(filtered_list)}")
+                file_list = filtered_list
+                # 过滤过程中更新的时间缓存写回磁盘，供下次运行复用
+                self._save_stat_cache()
             
+            # 记录本次找到的文件列表（邮件统计与正文展示使用）
+            self.found_files = list(file_list)
             total_files = len(file_list)
             
             if total_files == 0:
                 logger.info("没有找到可传输的文件")
-                if self.source_use_sftp:
-                    close_sftp(source_conn)
-                else:
-                    source_conn.quit()
                 # 准备并发送邮件
-                subject, body, is_html = self._prepare_email_content()
-                send_email_notification(self.email_config, subject, body, is_html)
+                self._notify()
                 return (0, 0, 0, 0)
             
             # 连接到目标FTP/SFTP服务器
-            dest_conn = None
             try:
-                if self.dest_use_sftp:
-                    # 使用SFTP连接
-                    dest_conn = connect_sftp(
-                        self.dest_host,
-                        self.dest_user,
-                        self.dest_pass,
-                        self.dest_port,
-                        self.dest_key_file,
-                        self.dest_passphrase
-                    )
-                else:
-                    # 使用FTP连接
-                    dest_conn = connect_ftp(
-                        self.dest_host, 
-                        self.dest_user, 
-                        self.dest_pass,
-                        self.dest_port,
-                        self.dest_encoding,
-                        use_ftps=self.dest_use_ftps,
-                        tls_implicit=self.dest_tls_implicit,
-                        use_passive=self.dest_use_passive,
-                    )
+                dest_conn = self._connect_dest()
+                # 目标目录在整个批次内不变，连接建立后切换一次即可，
+                # 省去每个文件一次cwd往返
+                if not self.dst.use_sftp:
+                    dest_conn.cwd(self.dst.directory)
             except Exception as e:
                 error_msg = f"连接目标服务器失败: {str(e)}"
                 logger.error(error_msg)
                 self.errors.append(error_msg)
-                if self.source_use_sftp:
-                    close_sftp(source_conn)
-                else:
-                    source_conn.quit()
                 # 准备并发送邮件
-                subject, body, is_html = self._prepare_email_content()
-                send_email_notification(self.email_config, subject, body, is_html)
+                self._notify()
                 return (total_files, 0, 0, 0)
             
+            # 预取目标目录列表，把逐文件的存在性探测合并为一次往返
+            self._dest_listing = self._fetch_dest_listing(dest_conn)
+
             # 逐个处理文件
             # 存储重命名的文件信息，用于在邮件中显示
             self.renamed_files = {}
-            
-            for filename in file_list:
-                logger.info(f"处理文件: {filename}")
-                
-                # 检查目标服务器是否已存在该文件
-                file_already_exists = False
-                if self.dest_use_sftp:
-                    file_already_exists = sftp_file_exists(dest_conn, self.dest_dir, filename)
-                else:
-                    file_already_exists = file_exists(dest_conn, self.dest_dir, filename)
-                
-                upload_filename = filename
-                
-                if file_already_exists:
-                    strategy = self.file_exists_strategy.lower()
-                    
-                    if strategy == 'skip':
-                        logger.info(f"目标服务器中已存在文件 {filename}，根据策略将跳过此文件")
-                        self.skipped_files.append(filename)
-                        continue
-                    elif strategy == 'overwrite':
-                        logger.warning(f"目标服务器中已存在文件 {filename}，根据策略将覆盖此文件")
-                        # 仍然使用原始文件名，覆盖已有文件
-                    elif strategy == 'rename':
-                        # 生成带时间戳的新文件名
-                        new_filename = self._generate_timestamped_filename(filename)
-                        logger.warning(f"目标服务器中已存在文件 {filename}，根据策略将重命名为 {new_filename} 上传")
-                        # 记录重命名的文件
-                        self.renamed_files[filename] = new_filename
-                        upload_filename = new_filename
-                    else:
-                        # 默认使用重命名策略
-                        logger.warning(f"未知的文件存在策略 '{strategy}'，将默认使用重命名策略")
-                        new_filename = self._generate_timestamped_filename(filename)
-                        self.renamed_files[filename] = new_filename
-                        upload_filename = new_filename
-                
-                # 创建临时本地文件路径
-                local_temp_path = os.path.join(self.archive_dir, f"temp_{upload_filename}")
-                
-                # 从源服务器下载文件到本地临时位置
-                download_success = False
-                if self.source_use_sftp:
-                    download_success = sftp_download_file(source_conn, filename, local_temp_path, self.source_dir)
-                else:
-                    # 确保在源目录
-                    try:
-                        source_conn.cwd(self.source_dir)
-                    except ftplib.error_perm:
-                        logger.error(f"无法切换到源目录: {self.source_dir}")
-                        self.failed_files[filename] = f"无法切换到源目录: {self.source_dir}"
-                        continue
-                    
-                    download_success = download_file(source_conn, filename, local_temp_path)
-                
-                if not download_success:
-                    # 更详细的失败原因记录
-                    error_details = f"下载失败: 系统找不到指定的文件 ({filename})"
-                    self.failed_files[filename] = error_details
-                    continue
-                
-                # 上传到目标服务器
-                upload_success = False
-                if self.dest_use_sftp:
-                    upload_success = sftp_upload_file(dest_conn, local_temp_path, upload_filename, self.dest_dir)
-                else:
-                    dest_conn.cwd(self.dest_dir)  # 确保在目标目录
-                    upload_success = upload_file(dest_conn, local_temp_path, upload_filename)
-                
-                if not upload_success:
-                    os.remove(local_temp_path)  # 清理临时文件
-                    self.failed_files[filename] = "上传失败"
-                    continue
-                
-                # 移动源文件到备份目录（如果配置了备份目录且启用了备份功能）
-                if self.source_enable_backup and self.source_backup_dir:
-                    logger.info(f"将文件 {filename} 移动到源服务器备份目录 {self.source_backup_dir}")
-                    move_success = False
-                    if self.source_use_sftp:
-                        move_success = sftp_move_remote_file(source_conn, filename, upload_filename, self.source_dir, self.source_backup_dir)
-                    else:
-                        move_success = move_remote_file(source_conn, filename, self.source_backup_dir + '/' + upload_filename)
-                    
-                    if move_success:
-                        # 如果文件被重命名，记录实际上传的文件名
-                        if filename in self.renamed_files:
-                            self.success_files.append(f"{filename} -> {self.renamed_files[filename]}")
-                        else:
-                            self.success_files.append(filename)
-                    else:
-                        self.failed_files[filename] = "移动源文件到备份目录失败"
-                else:
-                    if self.source_enable_backup:
-                        logger.info(f"未配置源服务器备份目录，跳过文件 {filename} 的备份")
-                    else:
-                        logger.info(f"源服务器备份功能已禁用，跳过文件 {filename} 的备份")
-                    # 如果文件被重命名，记录实际上传的文件名
-                    if filename in self.renamed_files:
-                        self.success_files.append(f"{filename} -> {self.renamed_files[filename]}")
-                    else:
-                        self.success_files.append(filename)
-                
-                # 清理临时文件
-                if os.path.exists(local_temp_path):
-                    os.remove(local_temp_path)
-            
-            # 关闭连接
-            if self.source_use_sftp:
-                close_sftp(source_conn)
-            else:
-                source_conn.quit()
-                
-            if self.dest_use_sftp:
-                close_sftp(dest_conn)
+            # 本批次的重命名时间戳只格式化一次
+            self._batch_timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+
+            workers = min(max(1, self.concurrency), len(file_list))
+            if workers == 1:
+                # 串行路径：保持单连接逐个处理
+                for filename in file_list:
+                    self._process_one(filename, source_conn, dest_conn)
             else:
-                dest_conn.quit()
-            
+                self._transfer_parallel(file_list, source_conn, dest_conn, workers)
+
             # 准备并发送邮件
-            subject, body, is_html = self._prepare_email_content()
-            send_email_notification(self.email_config, subject, body, is_html)
+            self._notify()
             
-            return (total_files, len(self.success_files), len(self.skipped_files), len(self.failed_files))
+            return self._stats()
         except Exception as e:
-            logger.error(f"文件传输过程中发生错误: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.exception(f"文件传输过程中发生错误: {str(e)}")
             # 记录错误信息
             self.errors.append(f"文件传输过程中发生错误: {str(e)}")
             
             # 准备并发送邮件
-            subject, body, is_html = self._prepare_email_content()
-            send_email_notification(self.email_config, subject, body, is_html)
+            self._notify()
             
             return (0, 0, 0, 0)
+        finally:
+            # 释放连接（FTP连接回到连接池，下次运行直接复用）
+            if source_conn is not None:
+                self._close_conn(source_conn, self.src.use_sftp)
+            if dest_conn is not None:
+                self._close_conn(dest_conn, self.dst.use_sftp)
@@ -1,7 +1,13 @@
+import atexit
 import os
 import ftplib
-import traceback
-import os
+import queue
+import re
+import ssl
+import stat
+import shutil
+import threading
+from contextlib import suppress
 from typing import List, Dict, Optional, Union
 import logging
 import paramiko  # 新增：导入paramiko库以支持SFTP
@@ -11,6 +17,77 @@ from zoneinfo import ZoneInfo
 logger = logging.getLogger(__name__)
 zone_info = ZoneInfo("Asia/Shanghai")
 
+# 模块级FTP连接池：同一进程内重复连接相同服务器时复用控制连接，
+# 省去TLS握手+LOGIN的固定开销。键为(host, port, user, use_ftps, tls_implicit)
+_CONN_POOL: Dict[tuple, queue.Queue] = {}
+_CONN_POOL_LOCK = threading.Lock()
+
+# 模块级SSH Transport池：SSH密钥交换+认证通常要数百毫秒，
+# 同一服务器的后续SFTP会话直接在已有Transport上开新通道（开销极小）
+_SFTP_POOL: Dict[tuple, paramiko.Transport] = {}
+_SFTP_POOL_LOCK = threading.Lock()
+
+
+def release_ftp(ftp) -> None:
+    """
+    归还FTP连接到模块级连接池，供后续connect_ftp复用
+
+    连接对象上没有记录池键（非本模块建立）时直接quit关闭
+
+    :param ftp: FTP连接对象
+    """
+    key = getattr(ftp, '_pool_key', None)
+    if key is None:
+        try:
+            ftp.quit()
+        except Exception as e:
+            logger.warning(f"关闭FTP连接时出错: {str(e)}")
+        return
+    with _CONN_POOL_LOCK:
+        pool = _CONN_POOL.setdefault(key, queue.Queue())
+    pool.put(ftp)
+    logger.info(f"FTP连接已归还连接池: {key[0]}:{key[1]}")
+
+
+def close_ftp_connections() -> None:
+    """关闭池中所有FTP连接，进程退出时自动调用
+
+    对每个连接发送QUIT优雅关闭，避免控制连接随进程退出被强制切断
+    """
+    with _CONN_POOL_LOCK:
+        pools = list(_CONN_POOL.values())
+        _CONN_POOL.clear()
+    for pool in pools:
+        while True:
+            try:
+                ftp = pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                ftp.quit()
+            except Exception:
+                pass
+
+
+atexit.register(close_ftp_connections)
+
+# 模块级SSL上下文缓存：create_default_context要读系统CA证书（毫秒级），
+# 按是否校验证书各构建一次后全程复用
+_TLS_CONTEXTS: Dict[bool, ssl.SSLContext] = {}
+
+
+def _get_tls_context(tls_verify: bool) -> ssl.SSLContext:
+    """获取复用的SSL上下文，首次调用时构建"""
+    ctx = _TLS_CONTEXTS.get(tls_verify)
+    if ctx is None:
+        if tls_verify:
+            ctx = ssl.create_default_context()
+        else:
+            ctx = ssl._create_unverified_context()
+        _TLS_CONTEXTS[tls_verify] = ctx
+    return ctx
+
+
 def connect_ftp(
     host: str, 
     user: str, 
@@ -36,24 +113,38 @@ def connect_ftp(
     :return: FTP或FTP_TLS连接对象
     :raises: 连接失败时抛出异常
     """
+    # 优先复用连接池中的空闲连接，用一次廉价的NOOP验证活性；
+    # 失效连接直接丢弃并继续新建
+    key = (host, port, user, use_ftps, tls_implicit)
+    with _CONN_POOL_LOCK:
+        pool = _CONN_POOL.get(key)
+    while pool is not None:
+        try:
+            ftp = pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            ftp.voidcmd('NOOP')
+            ftp.set_pasv(use_passive)
+            logger.info(f"复用连接池中的FTP连接: {host}:{port}")
+            return ftp
+        except Exception:
+            try:
+                ftp.close()
+            except Exception:
+                pass
+
     try:
         if use_ftps:
-            # 使用FTPS连接
+            # 使用FTPS连接：隐式/显式TLS共用同一建连序列，
+            # SSL上下文模块级复用，省去每次连接的上下文构建
             logger.info(f"连接到FTPS服务器: {host}:{port}")
-            if tls_implicit:
-                # 隐式TLS连接
-                ftp = ftplib.FTP_TLS()
-                ftp.encoding = encoding
-                ftp.connect(host, port, timeout=30)
-                ftp.login(user, password)
-                # 对于隐式TLS，通常不需要显式调用prot_p()
-            else:
-                # 显式TLS连接（默认）
-                ftp = ftplib.FTP_TLS()
-                ftp.encoding = encoding
-                ftp.connect(host, port, timeout=30)
-                ftp.login(user, password)
-                # 切换到安全数据连接
+            ftp = ftplib.FTP_TLS(context=_get_tls_context(tls_verify))
+            ftp.encoding = encoding
+            ftp.connect(host, port, timeout=30)
+            ftp.login(user, password)
+            if not tls_implicit:
+                # 显式TLS需要切换到安全数据连接；隐式TLS不需要prot_p()
                 ftp.prot_p()
             logger.info(f"成功连接到FTPS服务器: {host}")
         else:
@@ -67,43 +158,112 @@ def connect_ftp(
         
         # 设置被动模式
         ftp.set_pasv(use_passive)
+        # 记录池键，release_ftp据此归还连接
+        ftp._pool_key = key
         return ftp
     except Exception as e:
         conn_type = "FTPS" if use_ftps else "FTP"
         error_msg = f"连接{conn_type}服务器失败 {host}:{port}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         raise
 
+def _mlsd_supported(ftp: ftplib.FTP) -> bool:
+    """通过FEAT探测服务器是否支持MLSD，结果缓存在连接对象上"""
+    cached = getattr(ftp, '_mlsd_ok', None)
+    if cached is not None:
+        return cached
+    try:
+        ok = 'MLSD' in ftp.sendcmd('FEAT').upper()
+    except Exception:
+        ok = False
+    ftp._mlsd_ok = ok
+    return ok
+
+
+def _size_ok(ftp: ftplib.FTP, filename: str) -> bool:
+    """免cwd的存在性探测：调用方已位于目标目录时单次SIZE往返即可
+
+    :param ftp: FTP连接对象（当前目录须为目标目录）
+    :param filename: 文件名
+    :return: 文件是否存在
+    """
+    try:
+        ftp.size(filename)
+        return True
+    except ftplib.error_perm:
+        # 文件不存在（或为目录）时服务器返回550
+        return False
+
+
 def get_file_list(ftp: ftplib.FTP, directory: str) -> List[str]:
     """
-    获取FTP目录中的文件列表
-    
+    获取FTP目录中的文件列表（只含普通文件，不含目录）
+
+    优先用一次MLSD拿到名字+类型，替代旧实现对每个条目做
+    SIZE+两次CWD探测的N次往返；不支持MLSD的服务器回退解析LIST，
+    仍然只需一次数据传输。两者都不可用时才逐项探测
+
     :param ftp: FTP连接对象
     :param directory: 目录路径
     :return: 文件列表
     """
-    file_list = []
     try:
         ftp.cwd(directory)
         logger.info(f"获取目录文件列表: {directory}")
-        
-        # 列出目录内容
-        ftp.retrlines('NLST', lambda line: file_list.append(line))
-        
-        # 过滤出文件（排除目录）
-        files_only = []
-        for filename in file_list:
-            logger.info(f"检查文件: {filename} at {directory}")
-            if file_exists(ftp, directory, filename) and not is_directory(ftp, filename):
-                files_only.append(filename)
-        
+
+        files_only = None
+        if _mlsd_supported(ftp):
+            try:
+                files_only = [
+                    name for name, facts in ftp.mlsd(facts=['type'])
+                    if facts.get('type', 'file') == 'file'
+                ]
+            except Exception as e:
+                logger.warning(f"MLSD列表失败，回退LIST: {str(e)}")
+
+        if files_only is None:
+            # LIST回退：按模式列首字符排除目录/链接，一次数据传输完成
+            lines: List[str] = []
+            try:
+                ftp.dir(lines.append)
+                files_only = []
+                parsed_any = False
+                for line in lines:
+                    if not line:
+                        continue
+                    if line[0] in ('d', 'l'):
+                        parsed_any = True
+                        continue
+                    parts = line.split(None, 8)
+                    if len(parts) == 9:
+                        parsed_any = True
+                        files_only.append(parts[8])
+                if lines and not parsed_any:
+                    # 有输出却一行都解析不出：非Unix ls格式（如DOS/IIS），
+                    # 退回逐项探测而不是误报目录为空
+                    logger.warning("LIST输出无法按Unix格式解析，回退逐项探测")
+                    files_only = None
+            except Exception as e:
+                logger.warning(f"LIST列表解析失败，回退逐项探测: {str(e)}")
+                files_only = None
+
+        if files_only is None:
+            # 最后手段：NLST + 逐项存在性/目录探测（每项多次往返）
+            file_list: List[str] = []
+            ftp.retrlines('NLST', file_list.append)
+            # 上面已cwd到目标目录，用免cwd的探测，省去逐项拼路径
+            files_only = [
+                filename for filename in file_list
+                if _size_ok(ftp, filename) and not is_directory(ftp, filename)
+            ]
+
         logger.info(f"在目录 {directory} 中找到 {len(files_only)} 个文件")
         return files_only
     except Exception as e:
         error_msg = f"获取文件列表失败: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         raise
 
 def is_directory(ftp: ftplib.FTP, filename: str) -> bool:
@@ -132,71 +292,229 @@ def file_exists(ftp: ftplib.FTP, directory: str, filename: str) -> bool:
     :return: 文件是否存在
     """
     try:
-        original_dir = ftp.pwd()
-        ftp.cwd(directory)
-        
-        # 尝试获取文件大小，文件不存在会抛出异常
+        # 直接对完整路径发SIZE，一次往返；
+        # 旧实现的pwd+cwd+SIZE+cwd回跳需要四次往返且改变连接目录状态
         try:
-            ftp.size(filename)
-            exists = True
+            ftp.size(f"{directory.rstrip('/')}/{filename}")
+            return True
         except ftplib.error_perm:
-            exists = False
-        
-        ftp.cwd(original_dir)
-        return exists
+            # 文件不存在（或为目录）时服务器返回550
+            return False
     except Exception as e:
-        logger.error(f"检查文件存在性时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error(f"检查文件存在性时出错: {str(e)}", exc_info=True)
         return False
 
-def download_file(ftp: ftplib.FTP, filename: str, local_path: str) -> bool:
+def _can_kernel_copy(ftp: ftplib.FTP) -> bool:
+    """判断该FTP连接的下载能否走内核态拷贝
+
+    需要os.splice（Linux 3.10+），且数据连接必须是明文socket：
+    TLS加密的数据流只能在用户态解密，无法绕过Python层
+    """
+    return hasattr(os, 'splice') and not isinstance(ftp, ftplib.FTP_TLS)
+
+
+def _splice_socket_to_file(conn, f, blocksize: int) -> None:
+    """用splice把数据socket的内容经管道搬进本地文件
+
+    sendfile(2)不接受socket作为数据源，socket→文件方向的
+    内核态搬运要借助一条中转管道：socket→pipe→file两次splice
+    均不产生用户态拷贝
+
+    :param conn: FTP数据连接socket
+    :param f: 已打开的本地文件对象（二进制写模式）
+    :param blocksize: 单次splice的最大字节数
+    """
+    pipe_r, pipe_w = os.pipe()
+    try:
+        sock_fd = conn.fileno()
+        file_fd = f.fileno()
+        while True:
+            moved = os.splice(sock_fd, pipe_w, blocksize)
+            if moved == 0:
+                break
+            while moved > 0:
+                moved -= os.splice(pipe_r, file_fd, moved)
+    finally:
+        os.close(pipe_r)
+        os.close(pipe_w)
+
+
+def download_file(ftp: ftplib.FTP, filename: str, local_path: str, blocksize: int = 1 << 20) -> bool:
     """
     从FTP服务器下载文件
     
     :param ftp: FTP连接对象
     :param filename: 文件名
     :param local_path: 本地保存路径
+    :param blocksize: 数据块大小，默认1MiB（ftplib默认8KiB会产生大量小块recv）
     :return: 下载是否成功
     """
     try:
-        logger.info(f"下载文件: {filename} -> {local_path}")
-        with open(local_path, 'wb') as f:
-            ftp.retrbinary(f'RETR {filename}', f.write)
-        logger.info(f"文件下载成功: {filename}")
+        logger.info("下载文件: %s -> %s", filename, local_path)
+        if _can_kernel_copy(ftp):
+            # 明文FTP且内核支持splice：数据socket→管道→文件全程在内核完成，
+            # 不经过Python层bytes对象，省去每块一次用户态拷贝
+            ftp.voidcmd('TYPE I')
+            conn = ftp.transfercmd(f'RETR {filename}')
+            try:
+                with open(local_path, 'wb') as f:
+                    _splice_socket_to_file(conn, f, blocksize)
+            finally:
+                conn.close()
+            ftp.voidresp()
+        else:
+            # TLS数据连接或无splice平台：退回retrbinary，
+            # 本地缓冲对齐网络块大小，避免默认8KiB缓冲把每个数据块拆成多次write
+            with open(local_path, 'wb', buffering=blocksize) as f:
+                ftp.retrbinary(f'RETR {filename}', f.write, blocksize=blocksize)
+        logger.info("文件下载成功: %s", filename)
         return True
     except Exception as e:
         error_msg = f"下载文件失败 {filename}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         
-        # 清理失败的下载文件
-        if os.path.exists(local_path):
-            try:
-                os.remove(local_path)
-            except Exception as e2:
-                logger.warning(f"清理临时文件失败: {str(e2)}")
+        # 清理失败的下载文件：单次unlink代替exists+remove两次系统调用，
+        # 文件不存在直接忽略，避免检查与删除之间的竞态
+        try:
+            with suppress(FileNotFoundError):
+                os.unlink(local_path)
+        except Exception as e2:
+            logger.warning(f"清理临时文件失败: {str(e2)}")
         
         return False
 
-def upload_file(ftp: ftplib.FTP, local_path: str, remote_filename: str) -> bool:
+def upload_file(ftp: ftplib.FTP, local_path: str, remote_filename: str, blocksize: int = 1 << 20) -> bool:
     """
     上传文件到FTP服务器
     
     :param ftp: FTP连接对象
     :param local_path: 本地文件路径
     :param remote_filename: 远程文件名
+    :param blocksize: 数据块大小，默认1MiB（ftplib默认8KiB会产生大量小块send）
     :return: 上传是否成功
     """
     try:
-        logger.info(f"上传文件: {local_path} -> {remote_filename}")
-        with open(local_path, 'rb') as f:
-            ftp.storbinary(f'STOR {remote_filename}', f)
-        logger.info(f"文件上传成功: {remote_filename}")
+        logger.info("上传文件: %s -> %s", local_path, remote_filename)
+        ftp.voidcmd('TYPE I')
+        conn = ftp.transfercmd(f'STOR {remote_filename}')
+        try:
+            # socket.sendfile在支持的平台走os.sendfile零拷贝（文件→socket），
+            # TLS socket或其他平台自动退回用户态send循环，无需分支处理
+            with open(local_path, 'rb') as f:
+                conn.sendfile(f)
+            # FTPS数据socket须先完成TLS关闭握手(close_notify)，
+            # 与storbinary一致，否则严格的服务器把上传当作中断
+            if isinstance(conn, ssl.SSLSocket):
+                conn.unwrap()
+        finally:
+            conn.close()
+        ftp.voidresp()
+        logger.info("文件上传成功: %s", remote_filename)
         return True
     except Exception as e:
         error_msg = f"上传文件失败 {remote_filename}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
+        return False
+
+def pipe_transfer(
+    src_ftp: ftplib.FTP,
+    filename: str,
+    dst_ftp: ftplib.FTP,
+    upload_name: str,
+    blocksize: int = 1 << 20,
+) -> bool:
+    """
+    在两个FTP服务器之间流式中转文件，不落本地磁盘
+
+    打开目标服务器的STOR数据通道，把源服务器RETR的每个数据块
+    直接写入该通道，避免先写临时文件再读回的两次本地磁盘I/O
+
+    :param src_ftp: 源FTP连接对象（需已处于源目录）
+    :param filename: 源文件名
+    :param dst_ftp: 目标FTP连接对象（需已处于目标目录）
+    :param upload_name: 上传到目标服务器的文件名
+    :param blocksize: 数据块大小，默认1MiB
+    :return: 传输是否成功
+    """
+    try:
+        logger.info("流式传输文件: %s -> %s", filename, upload_name)
+        # 目标连接此前可能执行过NLST/retrlines（会发TYPE A），
+        # 必须显式切回二进制模式，否则服务器按ASCII转换行尾损坏文件
+        dst_ftp.voidcmd('TYPE I')
+        dst_sock = dst_ftp.transfercmd(f'STOR {upload_name}')
+        try:
+            src_ftp.retrbinary(f'RETR {filename}', dst_sock.sendall, blocksize=blocksize)
+            # FTPS数据socket须先完成TLS关闭握手(close_notify)，
+            # 与storbinary一致，否则严格的服务器把上传当作中断
+            if isinstance(dst_sock, ssl.SSLSocket):
+                dst_sock.unwrap()
+        finally:
+            dst_sock.close()
+        dst_ftp.voidresp()
+        logger.info("文件流式传输成功: %s", upload_name)
+        return True
+    except Exception as e:
+        error_msg = f"流式传输文件失败 {filename} -> {upload_name}: {str(e)}"
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
+        return False
+
+def relay_transfer(
+    src_conn,
+    src_is_sftp: bool,
+    src_directory: str,
+    filename: str,
+    dst_conn,
+    dst_is_sftp: bool,
+    dst_directory: str,
+    upload_name: str,
+    blocksize: int = 1 << 20,
+) -> bool:
+    """
+    在涉及SFTP的服务器组合之间流式中转文件，不落本地磁盘
+
+    SFTP侧通过paramiko文件句柄直接读写：读侧prefetch预取、
+    写侧set_pipelined流水化，数据块在两个连接之间直接流动，
+    省去先写临时文件再读回的两次本地磁盘I/O。
+    两端均为FTP时请使用pipe_transfer
+
+    :param src_conn: 源服务器连接对象
+    :param src_is_sftp: 源端是否为SFTP
+    :param src_directory: 源目录路径
+    :param filename: 源文件名
+    :param dst_conn: 目标服务器连接对象（FTP时需已处于目标目录）
+    :param dst_is_sftp: 目标端是否为SFTP
+    :param dst_directory: 目标目录路径
+    :param upload_name: 上传到目标服务器的文件名
+    :param blocksize: 数据块大小，默认1MiB
+    :return: 传输是否成功
+    """
+    try:
+        logger.info("流式传输文件: %s -> %s", filename, upload_name)
+        if src_is_sftp and dst_is_sftp:
+            with src_conn.open(f"{src_directory}/{filename}", 'rb') as src_fh, \
+                    dst_conn.open(f"{dst_directory}/{upload_name}", 'wb') as dst_fh:
+                src_fh.prefetch()
+                dst_fh.set_pipelined(True)
+                shutil.copyfileobj(src_fh, dst_fh, length=blocksize)
+        elif src_is_sftp:
+            # SFTP -> FTP：storbinary直接以SFTP文件句柄为读取源
+            with src_conn.open(f"{src_directory}/{filename}", 'rb') as src_fh:
+                src_fh.prefetch()
+                dst_conn.storbinary(f'STOR {upload_name}', src_fh, blocksize=blocksize)
+        else:
+            # FTP -> SFTP：RETR的数据块直接写入SFTP文件句柄
+            with dst_conn.open(f"{dst_directory}/{upload_name}", 'wb') as dst_fh:
+                dst_fh.set_pipelined(True)
+                src_conn.retrbinary(f'RETR {filename}', dst_fh.write, blocksize=blocksize)
+        logger.info("文件流式传输成功: %s", upload_name)
+        return True
+    except Exception as e:
+        error_msg = f"流式传输文件失败 {filename} -> {upload_name}: {str(e)}"
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         return False
 
 def move_remote_file(ftp: ftplib.FTP, source_filename: str, dest_filename: str) -> bool:
@@ -209,16 +527,78 @@ def move_remote_file(ftp: ftplib.FTP, source_filename: str, dest_filename: str)
     :return: 移动是否成功
     """
     try:
-        logger.info(f"移动文件: {source_filename} -> {dest_filename}")
+        logger.info("移动文件: %s -> %s", source_filename, dest_filename)
         ftp.rename(source_filename, dest_filename)
-        logger.info(f"文件移动成功: {source_filename} -> {dest_filename}")
+        logger.info("文件移动成功: %s -> %s", source_filename, dest_filename)
         return True
     except Exception as e:
         error_msg = f"移动文件失败 {source_filename} -> {dest_filename}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         return False
 
+# 已解析的私钥缓存：按(路径, 口令)保存PKey对象，
+# 同一密钥多次连接时跳过开销可观的PKCS解析
+_KEY_CACHE: Dict[tuple, paramiko.PKey] = {}
+_KEY_CACHE_LOCK = threading.Lock()
+
+# 按常见程度排序依次尝试的密钥类型（RSAKey只支持RSA，ed25519/ECDSA密钥会直接失败）
+_KEY_CLASSES = (
+    paramiko.Ed25519Key,
+    paramiko.ECDSAKey,
+    paramiko.RSAKey,
+)
+
+
+def _load_private_key(key_file: str, passphrase: Optional[str] = None) -> paramiko.PKey:
+    """加载SSH私钥，自动识别密钥类型并缓存解析结果
+
+    :param key_file: 私钥文件路径
+    :param passphrase: 私钥密码（如果私钥有密码）
+    :return: 解析后的PKey对象
+    :raises: 所有类型都解析失败时抛出SSHException
+    """
+    cache_key = (key_file, passphrase)
+    with _KEY_CACHE_LOCK:
+        cached = _KEY_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    last_error = None
+    for key_cls in _KEY_CLASSES:
+        try:
+            pkey = key_cls.from_private_key_file(key_file, password=passphrase)
+        except paramiko.PasswordRequiredException:
+            # 口令缺失与类型无关，继续尝试其他类型没有意义
+            raise
+        except paramiko.SSHException as e:
+            last_error = e
+            continue
+        with _KEY_CACHE_LOCK:
+            _KEY_CACHE[cache_key] = pkey
+        logger.info(f"加载私钥成功: {key_file} ({key_cls.__name__})")
+        return pkey
+
+    raise last_error if last_error is not None else paramiko.SSHException(
+        f"无法解析私钥文件: {key_file}"
+    )
+
+
+def _sftp_join(directory: str, filename: str) -> str:
+    """拼接SFTP远程路径
+
+    SFTP路径固定使用正斜杠，直接字符串拼接即可；
+    os.path.join在Windows上会先拼出反斜杠再全串replace，多一次分配和扫描
+
+    :param directory: 目录路径
+    :param filename: 文件名
+    :return: 拼接后的远程路径
+    """
+    if directory in ('', '.'):
+        return filename
+    return directory.rstrip('/') + '/' + filename
+
+
 def connect_sftp(
     host: str, 
     user: str, 
@@ -239,33 +619,51 @@ def connect_sftp(
     :return: SFTP客户端对象
     :raises: 连接失败时抛出异常
     """
+    # 已有活跃的Transport时直接复用：from_transport只是在既有连接上
+    # 开一条新通道，省去完整的密钥交换与认证
+    pool_key = (host, port, user, key_file or password)
+    with _SFTP_POOL_LOCK:
+        pooled = _SFTP_POOL.get(pool_key)
+    if pooled is not None:
+        if pooled.is_active():
+            logger.info(f"复用SSH连接开新SFTP通道: {host}:{port}")
+            return paramiko.SFTPClient.from_transport(pooled)
+        with _SFTP_POOL_LOCK:
+            _SFTP_POOL.pop(pool_key, None)
+
     try:
         logger.info(f"连接到SFTP服务器: {host}:{port}")
-        # 创建SSH客户端
-        ssh_client = paramiko.SSHClient()
-        # 自动添加未知主机密钥
-        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
+        # 直接构造Transport，绕过SSHClient的known_hosts查找与策略分发层；
+        # 行为等同于原来的AutoAddPolicy（不校验主机密钥）
+        transport = paramiko.Transport((host, port))
+        # 提高SSH通道窗口与单包上限：高带宽时延积链路上默认窗口（2MiB）
+        # 会先于带宽封顶，放大后prefetch/流水写才能填满管道。
+        # 在connect之前设置，首条通道即生效
+        transport.default_window_size = 2 ** 27
+        transport.default_max_packet_size = 2 ** 18
+
         # 连接服务器
         if key_file:
             # 使用密钥认证
             logger.info(f"使用密钥文件 {key_file} 连接到SFTP服务器")
-            key = paramiko.RSAKey.from_private_key_file(key_file, password=passphrase) if passphrase \
-                else paramiko.RSAKey.from_private_key_file(key_file)
-            ssh_client.connect(hostname=host, port=port, username=user, pkey=key)
+            pkey = _load_private_key(key_file, passphrase)
+            transport.connect(username=user, pkey=pkey)
         else:
             # 使用密码认证
             logger.info(f"使用密码连接到SFTP服务器")
-            ssh_client.connect(hostname=host, port=port, username=user, password=password)
-        
+            transport.connect(username=user, password=password)
+
         # 创建SFTP客户端
-        sftp_client = ssh_client.open_sftp()
+        sftp_client = paramiko.SFTPClient.from_transport(transport)
+        # Transport入池供后续复用（close_sftp只关通道，不断开SSH连接）
+        with _SFTP_POOL_LOCK:
+            _SFTP_POOL[pool_key] = transport
         logger.info(f"成功连接到SFTP服务器: {host}")
         return sftp_client
     except Exception as e:
         error_msg = f"连接SFTP服务器失败 {host}:{port}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         raise
 
 def get_sftp_file_list(sftp: paramiko.SFTPClient, directory: str) -> List[str]:
@@ -280,19 +678,20 @@ def get_sftp_file_list(sftp: paramiko.SFTPClient, directory: str) -> List[str]:
     try:
         logger.info(f"获取SFTP目录文件列表: {directory}")
         
-        # 列出目录内容
-        for item in sftp.listdir_attr(directory):
-            # 只添加文件（排除目录）
-            if not item.st_mode & 0o40000:  # 0o40000 表示目录
+        # 列出目录内容：listdir_iter流水线化READDIR请求并逐项产出，
+        # 超大目录也不会把整个列表先缓冲在内存里
+        for item in sftp.listdir_iter(directory, read_aheads=50):
+            # 只添加普通文件（排除目录、链接等）
+            if stat.S_ISREG(item.st_mode):
                 file_list.append(item.filename)
-                logger.info(f"找到文件: {item.filename}")
+                logger.info("找到文件: %s", item.filename)
         
         logger.info(f"在SFTP目录 {directory} 中找到 {len(file_list)} 个文件")
         return file_list
     except Exception as e:
         error_msg = f"获取SFTP文件列表失败: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         raise
 
 def sftp_file_exists(sftp: paramiko.SFTPClient, directory: str, filename: str) -> bool:
@@ -305,17 +704,16 @@ def sftp_file_exists(sftp: paramiko.SFTPClient, directory: str, filename: str) -
     :return: 文件是否存在
     """
     try:
-        file_path = os.path.join(directory, filename).replace('\\', '/')
+        file_path = _sftp_join(directory, filename)
         # 尝试获取文件属性，如果文件不存在会抛出异常
         sftp.stat(file_path)
-        logger.info(f"SFTP文件存在: {file_path}")
+        logger.info("SFTP文件存在: %s", file_path)
         return True
     except FileNotFoundError:
-        logger.info(f"SFTP文件不存在: {file_path}")
+        logger.info("SFTP文件不存在: %s", file_path)
         return False
     except Exception as e:
-        logger.error(f"检查SFTP文件存在性时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error(f"检查SFTP文件存在性时出错: {str(e)}", exc_info=True)
         return False
 
 def sftp_download_file(sftp: paramiko.SFTPClient, filename: str, local_path: str, directory: str = ".") -> bool:
@@ -329,22 +727,23 @@ def sftp_download_file(sftp: paramiko.SFTPClient, filename: str, local_path: str
     :return: 下载是否成功
     """
     try:
-        remote_path = os.path.join(directory, filename).replace('\\', '/')
-        logger.info(f"从SFTP下载文件: {remote_path} -> {local_path}")
+        remote_path = _sftp_join(directory, filename)
+        logger.info("从SFTP下载文件: %s -> %s", remote_path, local_path)
         sftp.get(remote_path, local_path)
-        logger.info(f"SFTP文件下载成功: {remote_path}")
+        logger.info("SFTP文件下载成功: %s", remote_path)
         return True
     except Exception as e:
         error_msg = f"下载SFTP文件失败 {remote_path}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         
-        # 清理失败的下载文件
-        if os.path.exists(local_path):
-            try:
-                os.remove(local_path)
-            except Exception as e2:
-                logger.warning(f"清理临时文件失败: {str(e2)}")
+        # 清理失败的下载文件：单次unlink代替exists+remove两次系统调用，
+        # 文件不存在直接忽略，避免检查与删除之间的竞态
+        try:
+            with suppress(FileNotFoundError):
+                os.unlink(local_path)
+        except Exception as e2:
+            logger.warning(f"清理临时文件失败: {str(e2)}")
         
         return False
 
@@ -359,15 +758,15 @@ def sftp_upload_file(sftp: paramiko.SFTPClient, local_path: str, remote_filename
     :return: 上传是否成功
     """
     try:
-        remote_path = os.path.join(directory, remote_filename).replace('\\', '/')
-        logger.info(f"上传文件到SFTP: {local_path} -> {remote_path}")
+        remote_path = _sftp_join(directory, remote_filename)
+        logger.info("上传文件到SFTP: %s -> %s", local_path, remote_path)
         sftp.put(local_path, remote_path)
-        logger.info(f"SFTP文件上传成功: {remote_path}")
+        logger.info("SFTP文件上传成功: %s", remote_path)
         return True
     except Exception as e:
         error_msg = f"上传SFTP文件失败 {remote_path}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         return False
 
 def sftp_move_remote_file(sftp: paramiko.SFTPClient, source_filename: str, dest_filename: str, source_dir: str = ".", dest_dir: str = ".") -> bool:
@@ -382,16 +781,22 @@ def sftp_move_remote_file(sftp: paramiko.SFTPClient, source_filename: str, dest_
     :return: 移动是否成功
     """
     try:
-        source_path = os.path.join(source_dir, source_filename).replace('\\', '/')
-        dest_path = os.path.join(dest_dir, dest_filename).replace('\\', '/')
-        logger.info(f"移动SFTP文件: {source_path} -> {dest_path}")
-        sftp.rename(source_path, dest_path)
-        logger.info(f"SFTP文件移动成功: {source_path} -> {dest_path}")
+        source_path = _sftp_join(source_dir, source_filename)
+        dest_path = _sftp_join(dest_dir, dest_filename)
+        logger.info("移动SFTP文件: %s -> %s", source_path, dest_path)
+        try:
+            # posix-rename扩展：目标已存在时原子覆盖，
+            # 避免重复传输时备份目录残留文件导致rename失败
+            sftp.posix_rename(source_path, dest_path)
+        except IOError:
+            # 服务器不支持posix-rename扩展时回退标准rename
+            sftp.rename(source_path, dest_path)
+        logger.info("SFTP文件移动成功: %s -> %s", source_path, dest_path)
         return True
     except Exception as e:
         error_msg = f"移动SFTP文件失败 {source_path} -> {dest_path}: {str(e)}"
-        logger.error(error_msg)
-        logger.debug(traceback.format_exc())
+        # exc_info由LogRecord延迟格式化，仅在handler真正输出时才展开调用栈
+        logger.error(error_msg, exc_info=True)
         return False
 
 def close_sftp(sftp: paramiko.SFTPClient) -> None:
@@ -405,8 +810,75 @@ def close_sftp(sftp: paramiko.SFTPClient) -> None:
         sftp.close()
         logger.info("SFTP连接已关闭")
     except Exception as e:
-        logger.warning(f"关闭SFTP连接时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.warning(f"关闭SFTP连接时出错: {str(e)}", exc_info=True)
+
+
+def _parse_mlsd_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """解析MLSD的modify/create时间值（YYYYMMDDHHMMSS[.sss]），失败返回None
+
+    格式固定，直接按位切片转int构造datetime，
+    比strptime快数倍（整目录批量解析时次数可观）
+    """
+    if not value:
+        return None
+    try:
+        return datetime.datetime(
+            int(value[0:4]), int(value[4:6]), int(value[6:8]),
+            int(value[8:10]), int(value[10:12]), int(value[12:14]),
+            tzinfo=zone_info,
+        )
+    except ValueError:
+        return None
+
+
+def batch_file_times(ftp: ftplib.FTP, directory: str) -> Optional[Dict[str, Dict]]:
+    """
+    通过一次MLSD列表批量获取FTP目录下所有文件的时间信息
+
+    逐文件MDTM/MLST每个文件都要一次往返，MLSD把整目录的时间
+    合并为一次请求。服务器不支持MLSD时返回None，由调用方回退
+
+    :param ftp: FTP连接对象
+    :param directory: 目录路径
+    :return: {文件名: {'modified_time':..., 'created_time':...}}，失败时返回None
+    """
+    try:
+        entries = {}
+        for name, facts in ftp.mlsd(directory, facts=['type', 'modify', 'create']):
+            # 只保留普通文件（type缺失的服务器条目也保留，由调用方兜底）
+            if facts.get('type') not in (None, 'file'):
+                continue
+            entries[name] = {
+                'modified_time': _parse_mlsd_time(facts.get('modify')),
+                'created_time': _parse_mlsd_time(facts.get('create')),
+            }
+        logger.info(f"MLSD批量获取 {directory} 下 {len(entries)} 个文件的时间信息")
+        return entries
+    except Exception as e:
+        logger.warning(f"MLSD批量获取文件时间失败，回退为逐文件查询: {str(e)}")
+        return None
+
+
+def sftp_batch_file_times(sftp: paramiko.SFTPClient, directory: str) -> Optional[Dict[str, Dict]]:
+    """
+    通过一次listdir_attr批量获取SFTP目录下所有文件的时间信息
+
+    :param sftp: SFTP客户端对象
+    :param directory: 目录路径
+    :return: {文件名: {'modified_time':..., 'created_time':...}}，失败时返回None
+    """
+    try:
+        entries = {}
+        for attr in sftp.listdir_attr(directory):
+            entries[attr.filename] = {
+                'modified_time': datetime.datetime.fromtimestamp(attr.st_mtime, tz=zone_info) if attr.st_mtime else None,
+                'created_time': None,  # SFTP属性里没有创建时间
+            }
+        logger.info(f"listdir_attr批量获取 {directory} 下 {len(entries)} 个文件的时间信息")
+        return entries
+    except Exception as e:
+        logger.warning(f"批量获取SFTP文件时间失败，回退为逐文件查询: {str(e)}")
+        return None
 
 
 def get_file_modification_time(ftp: ftplib.FTP, directory: str, filename: str) -> Optional[datetime.datetime]:
@@ -443,8 +915,7 @@ def get_file_modification_time(ftp: ftplib.FTP, directory: str, filename: str) -
         except ftplib.error_perm:
             logger.warning(f"无法获取文件 {filename} 的修改时间，服务器不支持MDTM命令")
     except Exception as e:
-        logger.error(f"获取文件修改时间时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error(f"获取文件修改时间时出错: {str(e)}", exc_info=True)
     finally:
         # 确保在所有路径中都能回到原始目录
         if original_dir:
@@ -455,6 +926,15 @@ def get_file_modification_time(ftp: ftplib.FTP, directory: str, filename: str) -
                 logger.warning(f"无法回到原始目录 {original_dir}")
         return result
 
+# 预编译的创建时间解析正则：匹配在C层完成，
+# 避免每次响应在Python层做多轮split/startswith扫描
+_MLST_CREATE_RE = re.compile(r'create=(\d{14})')
+# STAT输出因服务器而异，匹配"Created: 01-Jan-2023 12:00:00"（秒可省略）及中文变体
+_STAT_CREATED_RE = re.compile(
+    r'(?:Created:|创建时间:)\s*(\d{2}-\w{3}-\d{4})\s+(\d{2}):(\d{2})(?::(\d{2}))?'
+)
+
+
 def get_file_creation_time(ftp: ftplib.FTP, directory: str, filename: str) -> Optional[datetime.datetime]:
     """
     获取FTP服务器上文件的创建时间
@@ -482,30 +962,13 @@ def get_file_creation_time(ftp: ftplib.FTP, directory: str, filename: str) -> Op
             # 响应格式可能类似于: 250-Start of list for filename
             #                       modify=20230101000000;create=20221231000000;... filename
             #                       250 End of list
-            
-            for line in mlst_response.split('\n'):
-                line = line.strip()
-                # 查找包含create=的行
-                if 'create=' in line:
-                    # 提取创建时间信息
-                    create_time_str = None
-                    parts = line.split(';')
-                    for part in parts:
-                        if part.startswith('create='):
-                            create_time_str = part[7:21]  # 提取时间戳部分 YYYYMMDDHHMMSS
-                            break
-                    
-                    if create_time_str:
-                        # 解析时间戳
-                        year = int(create_time_str[0:4])
-                        month = int(create_time_str[4:6])
-                        day = int(create_time_str[6:8])
-                        hour = int(create_time_str[8:10])
-                        minute = int(create_time_str[10:12])
-                        second = int(create_time_str[12:14])
-                        
-                        ftp.cwd(original_dir)
-                        return datetime.datetime(year, month, day, hour, minute, second, tzinfo=zone_info)
+            # 预编译正则直接在整段响应上搜索，替代逐行split+逐段startswith扫描
+            m = _MLST_CREATE_RE.search(mlst_response)
+            if m:
+                result = _parse_mlsd_time(m.group(1))
+                if result is not None:
+                    ftp.cwd(original_dir)
+                    return result
         except ftplib.error_perm:
             logger.warning(f"无法使用MLST命令获取文件 {filename} 的创建时间，服务器可能不支持此命令")
         
@@ -519,40 +982,31 @@ def get_file_creation_time(ftp: ftplib.FTP, directory: str, filename: str) -> Op
             # 注意：STAT输出格式因服务器而异，这里只尝试基本解析
             for line in stat_lines:
                 # 例如: "Size: 1024       Created: 01-Jan-2023 12:00:00"
-                if 'Created:' in line or '创建时间:' in line:
-                    # 尝试从行中提取日期时间信息
+                m = _STAT_CREATED_RE.search(line)
+                if m:
                     try:
-                        # 假设格式为 "01-Jan-2023 12:00:00"
-                        time_str = line.split('Created:')[-1].strip() if 'Created:' in line else line.split('创建时间:')[-1].strip()
-                        # 尝试解析常见的日期格式
-                        try:
-                            # 格式: 01-Jan-2023 12:00:00
-                            dt = datetime.datetime.strptime(time_str.split()[0], '%d-%b-%Y')
-                            time_part = time_str.split()[1].split(':')
-                            hour = int(time_part[0])
-                            minute = int(time_part[1])
-                            second = int(time_part[2]) if len(time_part) > 2 else 0
-                            result = datetime.datetime(dt.year, dt.month, dt.day, hour, minute, second, tzinfo=zone_info)
-                            ftp.cwd(original_dir)
-                            return result
-                        except ValueError:
-                            # 尝试其他格式
-                            pass
-                    except Exception:
-                        # 解析失败，继续尝试
+                        dt = datetime.datetime.strptime(m.group(1), '%d-%b-%Y')
+                        result = datetime.datetime(
+                            dt.year, dt.month, dt.day,
+                            int(m.group(2)), int(m.group(3)), int(m.group(4) or 0),
+                            tzinfo=zone_info,
+                        )
+                    except ValueError:
+                        # 日期无法解析，继续尝试其他行
                         continue
+                    ftp.cwd(original_dir)
+                    return result
         except ftplib.error_perm:
             logger.warning(f"无法使用STAT命令获取文件 {filename} 的详细信息")
         
         # 方法3: 如果无法获取创建时间，返回修改时间作为备选
-        logger.info(f"无法直接获取文件 {filename} 的创建时间，返回修改时间作为备选")
+        logger.info("无法直接获取文件 %s 的创建时间，返回修改时间作为备选", filename)
         mod_time = get_file_modification_time(ftp, '.', filename)  # 使用当前目录('.')因为我们已经切换到了正确目录
         
         ftp.cwd(original_dir)
         return mod_time
     except Exception as e:
-        logger.error(f"获取文件创建时间时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error(f"获取文件创建时间时出错: {str(e)}", exc_info=True)
         return None
 
 
@@ -566,7 +1020,7 @@ def get_sftp_file_info(sftp: paramiko.SFTPClient, directory: str, filename: str)
     :return: 包含文件信息的字典，如果失败则返回None
     """
     try:
-        full_path = os.path.join(directory, filename)
+        full_path = _sftp_join(directory, filename)
         stat = sftp.stat(full_path)
         
         file_info = {
@@ -578,6 +1032,5 @@ def get_sftp_file_info(sftp: paramiko.SFTPClient, directory: str, filename: str)
         
         return file_info
     except Exception as e:
-        logger.error(f"获取SFTP文件信息时出错: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error(f"获取SFTP文件信息时出错: {str(e)}", exc_info=True)
         return None
\ No newline at end of file
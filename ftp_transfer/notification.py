@@ -1,11 +1,120 @@
+import atexit
 import smtplib
-import traceback
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.utils import formatdate
 from email.mime.multipart import MIMEMultipart
 from loguru import logger
 from typing import List, Dict, Optional
 
+# SMTP连接池：按(服务器, 端口, 用户名)复用已登录的SMTP_SSL连接，
+# 连续发送多封邮件时省去重复的TLS握手和登录
+_SMTP_POOL: Dict[tuple, smtplib.SMTP_SSL] = {}
+_SMTP_POOL_LOCK = threading.Lock()
+
+
+def _get_smtp_connection(email_config: Dict) -> smtplib.SMTP_SSL:
+    """获取已登录的SMTP连接，优先复用池中的活跃连接
+
+    :param email_config: 邮件配置字典
+    :return: 已登录的SMTP_SSL连接
+    """
+    key = (
+        email_config.get('smtp_server'),
+        email_config.get('smtp_port', 465),
+        email_config.get('smtp_username'),
+    )
+    with _SMTP_POOL_LOCK:
+        server = _SMTP_POOL.pop(key, None)
+
+    if server is not None:
+        try:
+            # NOOP验证连接仍然可用，远比重新握手登录廉价
+            if server.noop()[0] == 250:
+                return server
+        except Exception:
+            pass
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    server = smtplib.SMTP_SSL(
+        email_config.get('smtp_server'),
+        email_config.get('smtp_port', 465),
+        timeout=10,
+    )
+    server.login(
+        email_config.get('smtp_username'),
+        email_config.get('smtp_password'),
+    )
+    return server
+
+
+def _release_smtp_connection(email_config: Dict, server: smtplib.SMTP_SSL) -> None:
+    """发送完成后把连接放回池中，供后续通知复用"""
+    key = (
+        email_config.get('smtp_server'),
+        email_config.get('smtp_port', 465),
+        email_config.get('smtp_username'),
+    )
+    with _SMTP_POOL_LOCK:
+        old = _SMTP_POOL.get(key)
+        _SMTP_POOL[key] = server
+    if old is not None and old is not server:
+        try:
+            old.quit()
+        except Exception:
+            pass
+
+
+def close_smtp_connections() -> None:
+    """关闭池中所有SMTP连接，进程退出时自动调用"""
+    with _SMTP_POOL_LOCK:
+        servers = list(_SMTP_POOL.values())
+        _SMTP_POOL.clear()
+    for server in servers:
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+
+atexit.register(close_smtp_connections)
+
+# 后台发送线程：邮件发送不阻塞传输主流程。
+# 单线程即可保证同一账号的邮件顺序发出并复用池中连接；
+# 线程非守护，解释器退出前会等待未完成的发送
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='smtp_notify')
+
+
+def _log_send_result(future: Future) -> None:
+    """后台发送完成后的回调，失败时记录错误"""
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"后台发送邮件通知失败: {str(exc)}")
+
+
+def send_email_notification_async(
+    email_config: Dict,
+    subject: str,
+    body: str,
+    is_html: bool = False
+) -> None:
+    """在后台线程中发送邮件通知，调用方不等待SMTP往返
+
+    :param email_config: 邮件配置字典
+    :param subject: 邮件主题
+    :param body: 邮件正文
+    :param is_html: 是否为HTML格式邮件
+    """
+    future = _NOTIFY_EXECUTOR.submit(
+        send_email_notification, email_config, subject, body, is_html
+    )
+    future.add_done_callback(_log_send_result)
+
+
 def send_email_notification(
     email_config: Dict,
     subject: str,
@@ -47,25 +156,14 @@ def send_email_notification(
             msg['To'] = ', '.join(email_config.get('recipients', []))
             msg['Date'] = formatdate(localtime=True)
         
-        server_port = email_config.get('smtp_port', 465)
-        server = smtplib.SMTP_SSL(
-            email_config.get('smtp_server'),
-            server_port,
-            timeout=10,
-        )
-
-        # server.ehlo()
-        server.login(
-            email_config.get('smtp_username'),
-            email_config.get('smtp_password'),
-        )
-    
+        server = _get_smtp_connection(email_config)
+
         server.send_message(msg)
 
-        server.quit()
-        
+        # 不quit，连接放回池中供下一封邮件复用
+        _release_smtp_connection(email_config, server)
+
         logger.info("邮件通知发送成功")
     except Exception as e:
-        logger.error(f"发送邮件通知失败: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.exception(f"发送邮件通知失败: {str(e)}")
         raise
@@ -0,0 +1,11 @@
+from .base import BaseTransport
+from .factory import TransportFactory
+from .ftp import FTPTransport
+from .sftp import SFTPTransport
+
+__all__ = [
+    'BaseTransport',
+    'TransportFactory',
+    'FTPTransport',
+    'SFTPTransport',
+]
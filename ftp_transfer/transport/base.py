@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+class BaseTransport(ABC):
+    """传输协议插件基类
+
+    各协议实现（FTP/SFTP）继承此类并实现连接、断开、
+    文件列表和存在性检查等操作，上层通过统一接口调用
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        :param config: 端点配置字典，结构与配置文件的source/destination一致
+        """
+        self.config = config
+        self.host = config.get('host')
+        self.port = config.get('port')
+        self.user = config.get('user')
+        self.password = config.get('password')
+        self.encoding = config.get('encoding', 'utf-8')
+
+    @abstractmethod
+    def connect(self) -> bool:
+        """建立连接，成功返回True"""
+
+    @abstractmethod
+    def disconnect(self) -> None:
+        """断开连接"""
+
+    @abstractmethod
+    def get_file_list(self, directory: str) -> List[str]:
+        """获取目录中的文件列表（只含普通文件，不含目录）
+
+        :param directory: 目录路径
+        :return: 文件名列表
+        """
+
+    @abstractmethod
+    def file_exists(self, directory: str, filename: str) -> bool:
+        """检查文件是否存在
+
+        :param directory: 目录路径
+        :param filename: 文件名
+        :return: 文件是否存在
+        """
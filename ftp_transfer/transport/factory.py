@@ -0,0 +1,46 @@
+import logging
+from typing import Any, Dict
+
+from .base import BaseTransport
+from .ftp import FTPTransport
+from .sftp import SFTPTransport
+
+logger = logging.getLogger(__name__)
+
+
+class TransportFactory:
+    """传输协议插件工厂
+
+    根据配置中的type字段（或use_sftp开关）实例化对应的传输插件
+    """
+
+    # 协议名到实现类的注册表，新增协议时在此登记
+    _REGISTRY = {
+        'ftp': FTPTransport,
+        'sftp': SFTPTransport,
+    }
+
+    @classmethod
+    def create_transport(cls, config: Dict[str, Any]) -> BaseTransport:
+        """创建传输插件实例
+
+        :param config: 端点配置字典，type缺失时按use_sftp推断协议
+        :return: 传输插件实例
+        :raises ValueError: 协议类型未注册时抛出
+        """
+        transport_type = config.get('type') or ('sftp' if config.get('use_sftp') else 'ftp')
+        transport_cls = cls._REGISTRY.get(transport_type)
+        if transport_cls is None:
+            logger.error(f"未知的传输协议类型: {transport_type}")
+            raise ValueError(f"未知的传输协议类型: {transport_type}")
+        return transport_cls(config)
+
+    @staticmethod
+    def connect_transport(transport: BaseTransport) -> bool:
+        """建立传输连接，成功返回True"""
+        return transport.connect()
+
+    @staticmethod
+    def disconnect_transport(transport: BaseTransport) -> None:
+        """断开传输连接"""
+        transport.disconnect()
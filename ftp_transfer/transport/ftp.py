@@ -0,0 +1,83 @@
+import ftplib
+import logging
+from typing import Any, Dict, List
+
+from .base import BaseTransport
+
+logger = logging.getLogger(__name__)
+
+
+class FTPTransport(BaseTransport):
+    """FTP/FTPS协议传输插件"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.use_ftps = config.get('use_ftps', False)
+        self.tls_implicit = config.get('tls_implicit', False)
+        self.use_passive = config.get('use_passive', True)
+        self.ftp = None
+
+    def connect(self) -> bool:
+        """连接并登录FTP服务器"""
+        try:
+            self.ftp = ftplib.FTP_TLS() if self.use_ftps else ftplib.FTP()
+            self.ftp.encoding = self.encoding
+            self.ftp.connect(self.host, self.port, timeout=30)
+            self.ftp.login(self.user, self.password)
+            if self.use_ftps and not self.tls_implicit:
+                # 显式TLS需要切换到安全数据连接
+                self.ftp.prot_p()
+            self.ftp.set_pasv(self.use_passive)
+            logger.info(f"成功连接到FTP服务器: {self.host}:{self.port}")
+            return True
+        except Exception as e:
+            logger.error(f"连接FTP服务器失败 {self.host}:{self.port}: {str(e)}", exc_info=True)
+            return False
+
+    def disconnect(self) -> None:
+        """断开FTP连接"""
+        if self.ftp is None:
+            return
+        try:
+            self.ftp.quit()
+        except Exception:
+            # QUIT失败时直接关闭底层连接
+            self.ftp.close()
+        finally:
+            self.ftp = None
+
+    def get_file_list(self, directory: str) -> List[str]:
+        """获取目录中的文件列表（排除目录）
+
+        :param directory: 目录路径
+        :return: 文件名列表
+        """
+        self.ftp.cwd(directory)
+        names: List[str] = []
+        self.ftp.retrlines('NLST', names.append)
+        return [name for name in names if not self._is_directory(name)]
+
+    def _is_directory(self, filename: str) -> bool:
+        """通过尝试cwd判断条目是否为目录"""
+        current_dir = self.ftp.pwd()
+        try:
+            self.ftp.cwd(filename)
+        except ftplib.error_perm:
+            return False
+        self.ftp.cwd(current_dir)
+        return True
+
+    def file_exists(self, directory: str, filename: str) -> bool:
+        """检查文件是否存在
+
+        :param directory: 目录路径
+        :param filename: 文件名
+        :return: 文件是否存在
+        """
+        try:
+            self.ftp.cwd(directory)
+            self.ftp.size(filename)
+            return True
+        except ftplib.error_perm:
+            # 文件不存在（或为目录）时服务器返回550
+            return False
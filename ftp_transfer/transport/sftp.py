@@ -0,0 +1,83 @@
+import logging
+import stat
+from typing import Any, Dict, List
+
+import paramiko
+
+from .base import BaseTransport
+from ..ftp_operations import _load_private_key, _sftp_join
+
+logger = logging.getLogger(__name__)
+
+
+class SFTPTransport(BaseTransport):
+    """SFTP协议传输插件"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.key_file = config.get('key_file')
+        self.passphrase = config.get('passphrase')
+        self.ssh = None
+        self.sftp = None
+
+    def connect(self) -> bool:
+        """连接SFTP服务器并打开SFTP会话"""
+        try:
+            self.ssh = paramiko.SSHClient()
+            self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            if self.key_file:
+                # 密钥认证：复用带缓存的密钥加载（自动识别密钥类型）
+                pkey = _load_private_key(self.key_file, self.passphrase)
+                self.ssh.connect(
+                    hostname=self.host,
+                    port=self.port,
+                    username=self.user,
+                    pkey=pkey,
+                )
+            else:
+                self.ssh.connect(
+                    hostname=self.host,
+                    port=self.port,
+                    username=self.user,
+                    password=self.password,
+                )
+            self.sftp = self.ssh.open_sftp()
+            logger.info(f"成功连接到SFTP服务器: {self.host}:{self.port}")
+            return True
+        except Exception as e:
+            logger.error(f"连接SFTP服务器失败 {self.host}:{self.port}: {str(e)}", exc_info=True)
+            return False
+
+    def disconnect(self) -> None:
+        """断开SFTP会话与SSH连接"""
+        if self.sftp is not None:
+            self.sftp.close()
+            self.sftp = None
+        if self.ssh is not None:
+            self.ssh.close()
+            self.ssh = None
+
+    def get_file_list(self, directory: str) -> List[str]:
+        """获取目录中的文件列表（只含普通文件）
+
+        :param directory: 目录路径
+        :return: 文件名列表
+        """
+        return [
+            item.filename
+            for item in self.sftp.listdir_attr(directory)
+            if stat.S_ISREG(item.st_mode)
+        ]
+
+    def file_exists(self, directory: str, filename: str) -> bool:
+        """检查文件是否存在
+
+        :param directory: 目录路径
+        :param filename: 文件名
+        :return: 文件是否存在
+        """
+        try:
+            self.sftp.stat(_sftp_join(directory, filename))
+            return True
+        except IOError:
+            return False
@@ -1,3 +1,4 @@
+import functools
 import os
 import sys
 import site
@@ -5,12 +6,22 @@ import importlib.resources
 from typing import List, Tuple, Callable, Optional
 import datetime
 
+# 进程内不变的平台常量，导入时求值一次，
+# 路径拼装时不再重复查os.name和sys.executable
+_IS_POSIX = os.name == 'posix'
+_SYS_EXEC_DIR = os.path.dirname(sys.executable)
+
+
+@functools.cache
 def _get_system_share_paths() -> List[str]:
-    """获取系统共享目录路径（跨平台兼容）"""
+    """获取系统共享目录路径（跨平台兼容）
+
+    枚举涉及site.getsitepackages和多次stat，首次调用后缓存结果
+    """
     share_paths = []
     
     # 根据操作系统类型添加系统标准共享目录
-    if os.name == 'posix':  # Unix/Linux/macOS
+    if _IS_POSIX:  # Unix/Linux/macOS
         if os.path.exists('/usr/share'):
             share_paths.append('/usr/share')
         if os.path.exists('/usr/local/share'):
@@ -33,7 +44,7 @@ def _get_system_share_paths() -> List[str]:
     
     # 添加用户目录
     user_home = os.path.expanduser('~')
-    if os.name == 'posix':
+    if _IS_POSIX:
         user_share = os.path.join(user_home, '.local', 'share')
     elif os.name == 'nt':
         user_share = os.path.join(user_home, 'AppData', 'Local')
@@ -43,21 +54,27 @@ def _get_system_share_paths() -> List[str]:
     
     return share_paths
 
-def _paths_to_try(file_path: str) -> List[Callable[[], str]]:
-    """生成尝试查找文件的多个路径函数（跨平台兼容）"""
-    return [
-        # 方式1: 从当前工作目录查找
-        lambda: os.path.join(os.getcwd(), file_path),
-        # 方式2: 从包安装位置的父目录查找
-        lambda: os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), file_path),
-        # 方式3: 从Python安装目录查找
-        lambda: os.path.join(os.path.dirname(sys.executable), file_path),
-        # 方式4: 从用户目录查找
-        lambda: os.path.join(os.path.expanduser('~'), file_path),
-    ]
+# 候选基目录在进程内固定，导入时计算一次，
+# 省去每次查找时重建lambda列表和重复调用getcwd/abspath/expanduser
+_BASE_PATHS: Tuple[str, ...] = (
+    # 方式1: 当前工作目录
+    os.getcwd(),
+    # 方式2: 包安装位置的父目录
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    # 方式3: Python安装目录
+    os.path.dirname(sys.executable),
+    # 方式4: 用户目录
+    os.path.expanduser('~'),
+)
+
 
+def _paths_to_try(file_path: str) -> List[str]:
+    """生成尝试查找文件的多个候选路径（跨平台兼容）"""
+    return [os.path.join(base, file_path) for base in _BASE_PATHS]
+
+@functools.cache
 def _get_installed_examples_paths() -> List[str]:
-    """获取安装后的examples目录路径（跨平台兼容）"""
+    """获取安装后的examples目录路径（跨平台兼容），结果缓存在进程内"""
     example_paths = []
     
     # 获取系统共享目录
@@ -65,7 +82,7 @@ def _get_installed_examples_paths() -> List[str]:
         example_paths.append(os.path.join(share_path, 'ftp_transfer', 'examples'))
     
     # 添加Python安装目录下的share路径
-    python_share = os.path.join(os.path.dirname(sys.executable), 'share', 'ftp_transfer', 'examples')
+    python_share = os.path.join(_SYS_EXEC_DIR, 'share', 'ftp_transfer', 'examples')
     example_paths.append(python_share)
     
     # Windows特定路径
@@ -82,14 +99,17 @@ def _get_installed_examples_paths() -> List[str]:
     
     return example_paths
 
+@functools.lru_cache(maxsize=256)
 def find_from_examples(file_name: str) -> str:
-    """从 examples 目录查找文件，支持开发环境和安装环境"""
+    """从 examples 目录查找文件，支持开发环境和安装环境
+
+    查找结果缓存在进程内，重复读取同一文件时不再触发stat系统调用
+    """
     # 首先尝试开发环境中的examples目录
-    for path_func in _paths_to_try(os.path.join('examples', file_name)):
-        path = path_func()
+    for path in _paths_to_try(os.path.join('examples', file_name)):
         if os.path.exists(path):
             return path
-    
+
     # 然后尝试安装环境中的examples目录
     for examples_path in _get_installed_examples_paths():
         path = os.path.join(examples_path, file_name)
@@ -125,10 +145,10 @@ def parse_time_value_str(time_value: str) -> datetime.datetime:
         return datetime.datetime.strptime(time_value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=zone_info)
 
 
+@functools.lru_cache(maxsize=256)
 def find_from_package(file_name: str) -> str:
-    """从包安装位置查找文件"""
-    for path_func in _paths_to_try(file_name):
-        path = path_func()
+    """从包安装位置查找文件，查找结果缓存在进程内"""
+    for path in _paths_to_try(file_name):
         if os.path.exists(path):
             return path
     
@@ -1,54 +1,56 @@
 from setuptools import setup, find_packages
+import functools
 import os
 import sys
 from ftp_transfer import __version__, __author__, __email__
 
+# 候选基目录构建一次，read_file多次调用时不再重新拼装
+_READ_FILE_BASES = (
+    # 方式1: 当前脚本所在目录
+    os.path.dirname(__file__),
+    # 方式2: 当前工作目录
+    os.getcwd(),
+    # 方式3: 上级目录
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    # 方式4: Python安装目录
+    os.path.dirname(sys.executable),
+)
+
+
+@functools.lru_cache(maxsize=None)
 def read_file(filename):
-    """读取文件内容，支持在不同环境中查找文件"""
-    # 尝试多种方式查找文件
-    paths_to_try = [
-        # 方式1: 从当前脚本所在目录查找
-        os.path.join(os.path.dirname(__file__), filename),
-        # 方式2: 从当前工作目录查找
-        os.path.join(os.getcwd(), filename),
-        # 方式3: 从上级目录查找
-        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), filename),
-        # 方式4: 从Python安装目录查找
-        os.path.join(os.path.dirname(sys.executable), filename),
-    ]
-    
-    for path in paths_to_try:
+    """读取文件内容，支持在不同环境中查找文件，结果缓存在进程内"""
+    for base in _READ_FILE_BASES:
+        path = os.path.join(base, filename)
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-    
+            # 二进制读取后手动解码，跳过文本模式的换行转换层
+            with open(path, 'rb') as f:
+                return f.read().decode('utf-8')
+
     # 如果所有方式都失败，返回空字符串并给出警告
     print(f"警告: 无法读取文件 {filename}，将使用空内容。")
     return ""
 
 # 定义要包含的示例文件和目录结构
+# 路径分隔符和目标前缀只按平台算一次，不在每个文件上重复判断；
+# os.scandir的DirEntry自带类型信息，比os.walk少一次stat
+_SEP = os.sep if os.name == 'nt' else '/'
+_EXAMPLES_BASE = _SEP.join(('share', 'ftp_transfer', 'examples'))
+
 examples_data = []
-if os.path.exists('examples'):
-    for root, dirs, files in os.walk('examples'):
-        for file in files:
-            file_path = os.path.join(root, file)
-            # 计算相对路径，用于保持目录结构
-            relative_path = os.path.relpath(root, 'examples')
-            # 如果是根目录，relative_path会是'.'，需要特殊处理
-            if relative_path == '.':
-                # 确保在Windows上也能正确处理路径
-                if os.name == 'nt':  # Windows
-                    # 在Windows上，我们使用更适合Windows的安装路径
-                    target_dir = os.path.join('share', 'ftp_transfer', 'examples')
-                else:  # Unix/Linux/macOS
-                    target_dir = 'share/ftp_transfer/examples'
-            else:
-                # 使用os.path.join确保跨平台路径分隔符正确
-                if os.name == 'nt':
-                    target_dir = os.path.join('share', 'ftp_transfer', 'examples', relative_path)
-                else:
-                    target_dir = f'share/ftp_transfer/examples/{relative_path}'
-            examples_data.append((target_dir, [file_path]))
+
+def _collect_examples(directory, target_dir):
+    files = []
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            _collect_examples(entry.path, target_dir + _SEP + entry.name)
+        elif entry.is_file():
+            files.append(entry.path)
+    if files:
+        examples_data.append((target_dir, files))
+
+if os.path.isdir('examples'):
+    _collect_examples('examples', _EXAMPLES_BASE)
 
 setup(
     name="ftp_transfer",
@@ -59,7 +61,8 @@ setup(
     long_description=read_file("readme.md"),
     long_description_content_type="text/markdown",
     url="https://github.com/emryslou/ftp_transfer",  # 替换为实际仓库地址
-    packages=find_packages(),
+    # 限定包含范围，避免find_packages走遍examples/tests等整个源码树
+    packages=find_packages(include=['ftp_transfer', 'ftp_transfer.*']),
     include_package_data=True,
     # 明确指定包数据
     package_data={
@@ -77,6 +80,13 @@ setup(
         "pyyaml>=6.0",
         "paramiko>=3.0.0",  # 新增：用于支持SFTP功能
     ],
+    extras_require={
+        # pytest-xdist用于多核并行跑测试（pytest -n auto）
+        "test": [
+            "pytest",
+            "pytest-xdist",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "ftp_transfer = ftp_transfer.cli:main",
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 项目根目录加入sys.path一次，供python -m unittest tests.xxx方式运行；
+# pytest运行时由conftest.py完成同样的设置
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
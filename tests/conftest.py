@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 项目根目录加入sys.path一次，各测试文件不再需要各自insert
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
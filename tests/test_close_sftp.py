@@ -1,10 +1,13 @@
 import logging
+import os
 import sys
 import traceback
-from unittest.mock import MagicMock
+from unittest.mock import Mock
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, '/opt/Dev/Code/Python/ftp_transfer')
+# 添加项目根目录到Python路径（按文件位置计算，避免硬编码绝对路径）
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
 # 导入修改过的close_sftp函数
 from ftp_transfer.ftp_operations import close_sftp
@@ -16,8 +19,8 @@ logging.basicConfig(level=logging.DEBUG)
 def test_close_sftp():
     print("测试close_sftp函数...")
     
-    # 创建一个模拟的SFTP客户端对象
-    mock_sftp = MagicMock()
+    # 创建一个模拟的SFTP客户端对象（spec限定属性面，比裸MagicMock更轻）
+    mock_sftp = Mock(spec=['close'])
     
     try:
         # 调用我们修改过的close_sftp函数
@@ -1,18 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os
-import sys
+import copy
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock
 from datetime import datetime
 import ftplib
 
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # 导入要测试的模块
 from ftp_transfer.ftp_operations import (
+    batch_file_times,
     connect_ftp,
     get_file_list,
     file_exists,
@@ -24,19 +21,22 @@ from ftp_transfer.ftp_operations import (
 )
 
 class TestFTPOperations(unittest.TestCase):
-    
+
+    # 配置模板类级构建一次，避免每个用例重复搭字典
+    _BASE_FTP_CONFIG = {
+        'host': 'test.ftp.server',
+        'user': 'test_user',
+        'password': 'test_pass',
+        'port': 21,
+        'encoding': 'utf-8',
+        'use_ftps': False,
+        'tls_implicit': False,
+        'use_passive': True
+    }
+
     def setUp(self):
-        # 准备测试配置
-        self.ftp_config = {
-            'host': 'test.ftp.server',
-            'user': 'test_user',
-            'password': 'test_pass',
-            'port': 21,
-            'encoding': 'utf-8',
-            'use_ftps': False,
-            'tls_implicit': False,
-            'use_passive': True
-        }
+        # 深拷贝模板，用例内的修改不会串到其他用例
+        self.ftp_config = copy.deepcopy(self._BASE_FTP_CONFIG)
     
     @patch('ftp_transfer.ftp_operations.ftplib.FTP')
     def test_get_file_modification_time_success(self, mock_ftp_class):
@@ -59,11 +59,13 @@ class TestFTPOperations(unittest.TestCase):
         self.assertEqual(result.minute, 0)
         self.assertEqual(result.second, 0)
         
-        # 验证方法调用
-        mock_ftp.pwd.assert_called_once()
-        mock_ftp.cwd.assert_any_call('/test/dir')
-        mock_ftp.sendcmd.assert_called_with('MDTM test.txt')
-        mock_ftp.cwd.assert_any_call('/current/dir')
+        # 验证方法调用：一次序列比较替代多次线性扫描，顺序错误也能暴露
+        self.assertEqual(mock_ftp.mock_calls, [
+            call.pwd(),
+            call.cwd('/test/dir'),
+            call.sendcmd('MDTM test.txt'),
+            call.cwd('/current/dir'),
+        ])
     
     @patch('ftp_transfer.ftp_operations.ftplib.FTP')
     def test_get_file_modification_time_unsupported(self, mock_ftp_class):
@@ -81,9 +83,12 @@ class TestFTPOperations(unittest.TestCase):
         self.assertIsNone(result)
         
         # 验证方法调用
-        mock_ftp.cwd.assert_any_call('/test/dir')
-        mock_ftp.sendcmd.assert_called_with('MDTM test.txt')
-        mock_ftp.cwd.assert_any_call('/current/dir')
+        self.assertEqual(mock_ftp.mock_calls, [
+            call.pwd(),
+            call.cwd('/test/dir'),
+            call.sendcmd('MDTM test.txt'),
+            call.cwd('/current/dir'),
+        ])
     
     @patch('ftp_transfer.ftp_operations.ftplib.FTP')
     @patch('ftp_transfer.ftp_operations.get_file_modification_time')
@@ -111,10 +116,12 @@ class TestFTPOperations(unittest.TestCase):
         self.assertEqual(result.second, 0)
         
         # 验证方法调用
-        mock_ftp.pwd.assert_called_once()
-        mock_ftp.cwd.assert_any_call('/test/dir')
-        mock_ftp.sendcmd.assert_called_with('MLST test.txt')
-        mock_ftp.cwd.assert_any_call('/current/dir')
+        self.assertEqual(mock_ftp.mock_calls, [
+            call.pwd(),
+            call.cwd('/test/dir'),
+            call.sendcmd('MLST test.txt'),
+            call.cwd('/current/dir'),
+        ])
         # 因为MLST成功，不应该调用get_file_modification_time
         mock_get_mod_time.assert_not_called()
     
@@ -148,10 +155,13 @@ class TestFTPOperations(unittest.TestCase):
         self.assertEqual(result.second, 0)
         
         # 验证方法调用
-        mock_ftp.cwd.assert_any_call('/test/dir')
-        mock_ftp.sendcmd.assert_called_with('MLST test.txt')
-        mock_ftp.retrlines.assert_called_with('STAT test.txt', unittest.mock.ANY)
-        mock_ftp.cwd.assert_any_call('/current/dir')
+        self.assertEqual(mock_ftp.mock_calls, [
+            call.pwd(),
+            call.cwd('/test/dir'),
+            call.sendcmd('MLST test.txt'),
+            call.retrlines('STAT test.txt', unittest.mock.ANY),
+            call.cwd('/current/dir'),
+        ])
         # 因为STAT成功，不应该调用get_file_modification_time
         mock_get_mod_time.assert_not_called()
     
@@ -179,12 +189,48 @@ class TestFTPOperations(unittest.TestCase):
         self.assertEqual(result, expected_time)
         
         # 验证方法调用
-        mock_ftp.cwd.assert_any_call('/test/dir')
-        mock_ftp.sendcmd.assert_called_with('MLST test.txt')
-        mock_ftp.retrlines.assert_called_with('STAT test.txt', unittest.mock.ANY)
+        self.assertEqual(mock_ftp.mock_calls, [
+            call.pwd(),
+            call.cwd('/test/dir'),
+            call.sendcmd('MLST test.txt'),
+            call.retrlines('STAT test.txt', unittest.mock.ANY),
+            call.cwd('/current/dir'),
+        ])
         mock_get_mod_time.assert_called_with(mock_ftp, '.', 'test.txt')
-        mock_ftp.cwd.assert_any_call('/current/dir')
     
+    @patch('ftp_transfer.ftp_operations.ftplib.FTP')
+    def test_batch_file_times_single_mlsd(self, mock_ftp_class):
+        """测试一次MLSD批量获取整目录文件时间"""
+        # 设置模拟对象
+        mock_ftp = mock_ftp_class.return_value
+        mock_ftp.mlsd.return_value = [
+            ('a.txt', {'type': 'file', 'modify': '20230102120000', 'create': '20230101100000'}),
+            ('sub', {'type': 'dir', 'modify': '20230103120000'}),
+            ('b.txt', {'type': 'file', 'modify': '20230104080000'}),
+        ]
+
+        # 调用函数
+        result = batch_file_times(mock_ftp, '/test/dir')
+
+        # 验证结果：目录被排除，时间解析正确，create缺失时为None
+        self.assertEqual(set(result), {'a.txt', 'b.txt'})
+        self.assertEqual(result['a.txt']['modified_time'].day, 2)
+        self.assertEqual(result['a.txt']['created_time'].hour, 10)
+        self.assertIsNone(result['b.txt']['created_time'])
+
+        # 验证整目录只发起一次MLSD请求
+        mock_ftp.mlsd.assert_called_once_with('/test/dir', facts=['type', 'modify', 'create'])
+
+    @patch('ftp_transfer.ftp_operations.ftplib.FTP')
+    def test_batch_file_times_unsupported(self, mock_ftp_class):
+        """测试服务器不支持MLSD时返回None由调用方回退"""
+        mock_ftp = mock_ftp_class.return_value
+        mock_ftp.mlsd.side_effect = ftplib.error_perm('500 Command not implemented')
+
+        result = batch_file_times(mock_ftp, '/test/dir')
+
+        self.assertIsNone(result)
+
     @patch('ftp_transfer.ftp_operations.ftplib.FTP')
     def test_get_file_creation_time_exception(self, mock_ftp_class):
         """测试获取文件创建时间时发生异常"""
@@ -1,36 +1,38 @@
+import copy
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import DEFAULT, Mock, patch
 from ftp_transfer.core import FTPTransfer
 
 class TestFTPTransfer(unittest.TestCase):
     """FTP传输工具的单元测试"""
-    
-    @patch('ftp_transfer.core.load_config')
-    @patch('ftp_transfer.core.setup_logger')
-    def setUp(self, mock_setup_logger, mock_load_config):
-        """测试前的准备工作"""
-        # 模拟配置
-        mock_config = {
-            'source': {
-                'host': 'test.source.com',
-                'user': 'user',
-                'password': 'pass',
-                'directory': '/test/source'
-            },
-            'destination': {
-                'host': 'test.dest.com',
-                'user': 'user',
-                'password': 'pass',
-                'directory': '/test/dest'
-            },
-            'archive_directory': './archive',
-            'log': {},
-            'email': {
-                'enable': False
-            }
+
+    # 配置模板类级构建一次，每个用例深拷贝后使用，
+    # 避免共享嵌套字典被某个用例改动后影响其他用例
+    _BASE_CONFIG = {
+        'source': {
+            'host': 'test.source.com',
+            'user': 'user',
+            'password': 'pass',
+            'directory': '/test/source'
+        },
+        'destination': {
+            'host': 'test.dest.com',
+            'user': 'user',
+            'password': 'pass',
+            'directory': '/test/dest'
+        },
+        'archive_directory': './archive',
+        'log': {},
+        'email': {
+            'enable': False
         }
-        mock_load_config.return_value = mock_config
-        
+    }
+
+    @patch.multiple('ftp_transfer.core', load_config=DEFAULT, setup_logger=DEFAULT)
+    def setUp(self, load_config, setup_logger):
+        """测试前的准备工作"""
+        load_config.return_value = copy.deepcopy(self._BASE_CONFIG)
+
         self.ftp_transfer = FTPTransfer('test_config.yaml')
     
     def test_initialization(self):
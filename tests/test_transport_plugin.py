@@ -1,193 +1,248 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os
-import sys
-import unittest
-from unittest.mock import patch, MagicMock
-from datetime import datetime
 import ftplib
-
-# 添加项目根目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+from types import MappingProxyType
+from unittest.mock import Mock, MagicMock, patch
 
 # 导入传输协议插件
+import ftp_transfer.transport.ftp as transport_ftp
+import ftp_transfer.transport.sftp as transport_sftp
 from ftp_transfer.transport.factory import TransportFactory
 from ftp_transfer.transport.base import BaseTransport
 from ftp_transfer.transport.ftp import FTPTransport
 from ftp_transfer.transport.sftp import SFTPTransport
 
+# 测试配置：模块级只读常量，避免每个用例重建字典且防止用例间误改
+FTP_CONFIG = MappingProxyType({
+    'type': 'ftp',
+    'host': 'test.ftp.server',
+    'user': 'test_user',
+    'password': 'test_pass',
+    'port': 21,
+    'encoding': 'utf-8',
+    'use_ftps': False,
+    'tls_implicit': False,
+    'use_passive': True
+})
+
+SFTP_CONFIG = MappingProxyType({
+    'type': 'sftp',
+    'host': 'test.sftp.server',
+    'user': 'test_user',
+    'password': 'test_pass',
+    'port': 22,
+    'key_file': None,
+    'passphrase': None
+})
+
+
+class FakeFTP:
+    """手写FTP桩：方法在__init__中一次性声明为预配置的Mock属性，
+    避免MagicMock按属性名惰性创建子mock的开销"""
+
+    # NLST结果预先计算为元组，retrlines直接回放
+    _NLST_LINES = ('file1.txt', 'file2.txt', 'subdir')
+    # 列表条目中属于目录的名字，cwd据此决定成功还是550
+    _DIR_NAMES = ('subdir',)
+
+    def __init__(self, *args, **kwargs):
+        self.encoding = 'utf-8'
+        self.connect = Mock(return_value='220 ready')
+        self.login = Mock(return_value='230 Login successful')
+        self.cwd = Mock(side_effect=self._cwd)
+        self.pwd = Mock(return_value='/current/dir')
+        self.set_pasv = Mock(return_value=None)
+        self.size = Mock(return_value=1024)
+        self.quit = Mock(return_value='221 Bye')
+        self.close = Mock(return_value=None)
+        self.retrlines_calls = []
+
+    def _cwd(self, path):
+        # 对普通文件的cwd返回550，与真实FTP服务器一致，
+        # 使生产代码的_is_directory无需打补丁即可被测试覆盖
+        if path in self._NLST_LINES and path not in self._DIR_NAMES:
+            raise ftplib.error_perm(f'550 {path}: Not a directory')
+        return '250 Directory successfully changed.'
+
+    def retrlines(self, cmd, callback):
+        self.retrlines_calls.append(cmd)
+        # 传输层只会发送裸NLST命令，直接用等值比较即可
+        lines = self._NLST_LINES if cmd == 'NLST' else ()
+        for line in lines:
+            callback(line)
+        return '226 Transfer complete'
+
+
+class DirEntry:
+    """listdir_attr返回项的轻量桩，__slots__省去每实例的__dict__"""
+
+    __slots__ = ('filename', 'st_mode', 'st_size')
+
+    def __init__(self, filename, st_mode, st_size):
+        self.filename = filename
+        self.st_mode = st_mode
+        self.st_size = st_size
+
+
+class FakeSFTPClient:
+    """手写SFTP会话桩"""
+
+    def __init__(self):
+        # 33188 表示普通文件，16877 表示目录
+        self.listdir_attr = Mock(return_value=[
+            DirEntry('file1.txt', st_mode=33188, st_size=1024),
+            DirEntry('file2.txt', st_mode=33188, st_size=2048),
+            DirEntry('subdir', st_mode=16877, st_size=0),
+        ])
+        self.stat = Mock(return_value=MagicMock())
+        self.close = Mock(return_value=None)
+
+
+class FakeSSHClient:
+    """手写SSHClient桩"""
+
+    def __init__(self):
+        self.set_missing_host_key_policy = Mock(return_value=None)
+        self.connect = Mock(return_value=None)
+        self.open_sftp = Mock(return_value=FakeSFTPClient())
+        self.close = Mock(return_value=None)
+
+
 class TestTransportPlugin(unittest.TestCase):
-    
+
+    ftp_config = FTP_CONFIG
+    sftp_config = SFTP_CONFIG
+
+    # 两种协议的列表用例共用的期望结果（桩数据中的普通文件）
+    EXPECTED_FILES = ['file1.txt', 'file2.txt']
+
+    # 桩与真实客户端类的对应关系，setUpClass据此校验桩的方法没有漂移
+    _STUB_SPECS = (
+        (FakeFTP, ftplib.FTP),
+        (FakeSSHClient, transport_sftp.paramiko.SSHClient),
+        (FakeSFTPClient, transport_sftp.paramiko.SFTPClient),
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        # 一次性校验桩实例的公开方法确实存在于真实类上，
+        # 取得MagicMock(spec=...)的防漂移效果而无逐用例的spec构建开销
+        for fake_cls, real_cls in cls._STUB_SPECS:
+            for name, value in vars(fake_cls()).items():
+                if isinstance(value, Mock):
+                    assert hasattr(real_cls, name), (
+                        f'{fake_cls.__name__}.{name} 在 {real_cls.__name__} 上不存在'
+                    )
+
+        # 用模块级桩类整体替换协议客户端类，避免每个用例重复打补丁；
+        # patch.object+addClassCleanup保证补丁限定在本类生命周期内，
+        # 异常提前退出或pytest-xdist多进程并行时也能正确还原
+        for target, attr, fake in ((transport_ftp.ftplib, 'FTP', FakeFTP),
+                                   (transport_sftp.paramiko, 'SSHClient', FakeSSHClient)):
+            patcher = patch.object(target, attr, fake)
+            patcher.start()
+            cls.addClassCleanup(patcher.stop)
+
+        # 已连接的共享夹具：只读用例复用，免去逐用例的连接握手
+        cls.ftp_transport = TransportFactory.create_transport(cls.ftp_config)
+        TransportFactory.connect_transport(cls.ftp_transport)
+        cls.sftp_transport = TransportFactory.create_transport(cls.sftp_config)
+        TransportFactory.connect_transport(cls.sftp_transport)
+        cls.addClassCleanup(TransportFactory.disconnect_transport, cls.ftp_transport)
+        cls.addClassCleanup(TransportFactory.disconnect_transport, cls.sftp_transport)
+
     def setUp(self):
-        # 准备测试配置
-        self.ftp_config = {
-            'type': 'ftp',
-            'host': 'test.ftp.server',
-            'user': 'test_user',
-            'password': 'test_pass',
-            'port': 21,
-            'encoding': 'utf-8',
-            'use_ftps': False,
-            'tls_implicit': False,
-            'use_passive': True
-        }
-        
-        self.sftp_config = {
-            'type': 'sftp',
-            'host': 'test.sftp.server',
-            'user': 'test_user',
-            'password': 'test_pass',
-            'port': 22,
-            'key_file': None,
-            'passphrase': None
-        }
-        
-    @patch('ftp_transfer.transport.ftp.ftplib.FTP')
-    def test_create_ftp_transport(self, mock_ftp):
-        """测试创建FTP传输实例"""
-        # 创建FTP传输实例
-        transport = TransportFactory.create_transport(self.ftp_config)
-        
-        # 验证是否创建了正确类型的实例
-        self.assertIsInstance(transport, FTPTransport)
-        self.assertIsInstance(transport, BaseTransport)
-        
-        # 验证配置是否正确设置
-        self.assertEqual(transport.host, self.ftp_config['host'])
-        self.assertEqual(transport.port, self.ftp_config['port'])
-    
-    @patch('ftp_transfer.transport.sftp.paramiko.Transport')
-    def test_create_sftp_transport(self, mock_transport):
-        """测试创建SFTP传输实例"""
-        # 创建SFTP传输实例
-        transport = TransportFactory.create_transport(self.sftp_config)
-        
-        # 验证是否创建了正确类型的实例
-        self.assertIsInstance(transport, SFTPTransport)
-        self.assertIsInstance(transport, BaseTransport)
-        
-        # 验证配置是否正确设置
-        self.assertEqual(transport.host, self.sftp_config['host'])
-        self.assertEqual(transport.port, self.sftp_config['port'])
-    
-    @patch('ftp_transfer.transport.ftp.ftplib.FTP')
-    def test_ftp_connect_and_disconnect(self, mock_ftp):
-        """测试FTP连接和断开"""
-        # 模拟FTP连接
-        mock_ftp_instance = mock_ftp.return_value
-        mock_ftp_instance.login.return_value = '230 Login successful'
-        mock_ftp_instance.cwd.return_value = '250 Directory successfully changed.'
-        
-        # 创建并连接FTP传输实例
-        transport = TransportFactory.create_transport(self.ftp_config)
-        connect_result = TransportFactory.connect_transport(transport)
-        
-        # 验证连接是否成功
-        self.assertTrue(connect_result)
-        mock_ftp_instance.login.assert_called_once_with(
-            self.ftp_config['user'], self.ftp_config['password']
-        )
-        
-        # 断开连接
-        TransportFactory.disconnect_transport(transport)
-        mock_ftp_instance.quit.assert_called_once()
-    
-    @patch('ftp_transfer.transport.sftp.paramiko.SSHClient')
-    def test_sftp_connect_and_disconnect(self, mock_ssh_client):
-        """测试SFTP连接和断开"""
-        # 模拟SFTP连接
-        mock_ssh_instance = mock_ssh_client.return_value
-        mock_sftp = MagicMock()
-        mock_ssh_instance.open_sftp.return_value = mock_sftp
-        
-        # 创建并连接SFTP传输实例
-        transport = TransportFactory.create_transport(self.sftp_config)
-        connect_result = TransportFactory.connect_transport(transport)
-        
-        # 验证连接是否成功
-        self.assertTrue(connect_result)
-        mock_ssh_instance.connect.assert_called_once_with(
-            hostname=self.sftp_config['host'],
-            port=self.sftp_config['port'],
-            username=self.sftp_config['user'],
-            password=self.sftp_config['password']
-        )
-        
-        # 断开连接
-        TransportFactory.disconnect_transport(transport)
-        mock_sftp.close.assert_called_once()
-        mock_ssh_instance.close.assert_called_once()
-    
-    @patch('ftp_transfer.transport.ftp.ftplib.FTP')
-    def test_ftp_file_operations(self, mock_ftp):
+        # 重置共享夹具上的调用记录，保证用例之间互不影响
+        for fake in (self.ftp_transport.ftp,
+                     self.sftp_transport.ssh,
+                     self.sftp_transport.sftp):
+            for attr in vars(fake).values():
+                if isinstance(attr, Mock):
+                    attr.reset_mock()
+                elif isinstance(attr, list):
+                    attr.clear()
+
+    def test_create_transport(self):
+        """测试按配置创建各协议的传输实例"""
+        for config, expected_cls in ((self.ftp_config, FTPTransport),
+                                     (self.sftp_config, SFTPTransport)):
+            with self.subTest(proto=config['type']):
+                transport = TransportFactory.create_transport(config)
+
+                # 验证是否创建了正确类型的实例
+                self.assertIsInstance(transport, expected_cls)
+                self.assertIsInstance(transport, BaseTransport)
+
+                # 验证配置是否正确设置
+                self.assertEqual(transport.host, config['host'])
+                self.assertEqual(transport.port, config['port'])
+
+    def test_connect_and_disconnect(self):
+        """测试各协议的连接和断开"""
+        for config in (self.ftp_config, self.sftp_config):
+            with self.subTest(proto=config['type']):
+                # 创建并连接传输实例
+                transport = TransportFactory.create_transport(config)
+                connect_result = TransportFactory.connect_transport(transport)
+                self.assertTrue(connect_result)
+
+                if config['type'] == 'ftp':
+                    fake_ftp = transport.ftp
+                    fake_ftp.login.assert_called_once_with(
+                        config['user'], config['password']
+                    )
+                    TransportFactory.disconnect_transport(transport)
+                    fake_ftp.quit.assert_called_once()
+                else:
+                    fake_ssh = transport.ssh
+                    fake_sftp = transport.sftp
+                    fake_ssh.connect.assert_called_once_with(
+                        hostname=config['host'],
+                        port=config['port'],
+                        username=config['user'],
+                        password=config['password']
+                    )
+                    TransportFactory.disconnect_transport(transport)
+                    fake_sftp.close.assert_called_once()
+                    fake_ssh.close.assert_called_once()
+
+    def test_ftp_file_operations(self):
         """测试FTP文件操作"""
-        # 模拟FTP连接和文件操作
-        mock_ftp_instance = mock_ftp.return_value
-        mock_ftp_instance.login.return_value = '230 Login successful'
-        mock_ftp_instance.cwd.return_value = '250 Directory successfully changed.'
-        mock_ftp_instance.size.return_value = 1024
-        
-        # 模拟retrlines方法
-        def mock_retrlines(cmd, callback):
-            if cmd.startswith('NLST'):
-                for file in ['file1.txt', 'file2.txt', 'subdir']:
-                    callback(file)
-            return '226 Transfer complete'
-        mock_ftp_instance.retrlines.side_effect = mock_retrlines
-        
-        # 创建并连接FTP传输实例
-        transport = TransportFactory.create_transport(self.ftp_config)
-        TransportFactory.connect_transport(transport)
-        
-        # 模拟_is_directory方法，使subdir被识别为目录，file1.txt和file2.txt被识别为文件
-        original_is_directory = transport._is_directory
-        transport._is_directory = lambda filename: filename == 'subdir'
-        
-        # 测试获取文件列表 - 只返回文件，不返回目录
+        # 复用已连接的共享FTP夹具
+        transport = self.ftp_transport
+        fake_ftp = transport.ftp
+
+        # 测试获取文件列表 - FakeFTP的cwd对普通文件返回550，
+        # 由真实的_is_directory区分出subdir为目录
         file_list = transport.get_file_list('/test/dir')
-        self.assertEqual(file_list, ['file1.txt', 'file2.txt'])
+        self.assertListEqual(file_list, self.EXPECTED_FILES)
         # 检查是否调用了cwd，但不验证具体参数，因为实际实现可能使用pwd()
-        mock_ftp_instance.cwd.assert_called()
-        mock_ftp_instance.retrlines.assert_called_once_with('NLST', unittest.mock.ANY)
-        
-        # 恢复原始方法
-        transport._is_directory = original_is_directory
-        
+        fake_ftp.cwd.assert_called()
+        self.assertEqual(fake_ftp.retrlines_calls, ['NLST'])
+
         # 测试文件是否存在 - file_exists方法需要两个参数：directory和filename
-        mock_ftp_instance.size.return_value = 1024
         exists = transport.file_exists('/test/dir', 'file1.txt')
         self.assertTrue(exists)
-        mock_ftp_instance.size.assert_called_with('file1.txt')
-    
-    @patch('ftp_transfer.transport.sftp.paramiko.SSHClient')
-    def test_sftp_file_operations(self, mock_ssh_client):
+        fake_ftp.size.assert_called_with('file1.txt')
+
+    def test_sftp_file_operations(self):
         """测试SFTP文件操作"""
-        # 模拟SFTP连接和文件操作
-        mock_ssh_instance = mock_ssh_client.return_value
-        mock_sftp = MagicMock()
-        mock_ssh_instance.open_sftp.return_value = mock_sftp
-        # 33188 表示普通文件，16877 表示目录
-        mock_sftp.listdir_attr.return_value = [
-            MagicMock(filename='file1.txt', st_mode=33188, st_size=1024),
-            MagicMock(filename='file2.txt', st_mode=33188, st_size=2048),
-            MagicMock(filename='subdir', st_mode=16877, st_size=0)
-        ]
-        
-        # 创建并连接SFTP传输实例
-        transport = TransportFactory.create_transport(self.sftp_config)
-        TransportFactory.connect_transport(transport)
-        
+        # 复用已连接的共享SFTP夹具
+        transport = self.sftp_transport
+        fake_sftp = transport.sftp
+
         # 测试获取文件列表 - 只返回文件，不返回目录
         file_list = transport.get_file_list('/test/dir')
-        self.assertEqual(file_list, ['file1.txt', 'file2.txt'])
-        mock_sftp.listdir_attr.assert_called_with('/test/dir')
-        
+        self.assertListEqual(file_list, self.EXPECTED_FILES)
+        fake_sftp.listdir_attr.assert_called_with('/test/dir')
+
         # 测试文件是否存在
-        mock_sftp.stat.return_value = MagicMock()
         exists = transport.file_exists('/test/dir', 'file1.txt')
         self.assertTrue(exists)
-        mock_sftp.stat.assert_called_with('/test/dir/file1.txt')
+        fake_sftp.stat.assert_called_with('/test/dir/file1.txt')
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()